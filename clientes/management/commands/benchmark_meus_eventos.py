@@ -0,0 +1,66 @@
+from time import perf_counter
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.template import Context, Template
+from django.test.utils import CaptureQueriesContext
+
+from clientes.views import eventos_com_certificado
+from eventos.models import Certificado, Evento
+
+# implementação antiga: percorre todos os certificados do usuário em cada evento
+TEMPLATE_ANTIGO = Template(
+    '{% for evento in eventos %}{{ evento.nome }}'
+    '{% for certificado in certificados %}{% if certificado.evento == evento %}'
+    '{{ certificado.imagem_url }}{% endif %}{% endfor %}{% endfor %}'
+)
+TEMPLATE_NOVO = Template(
+    '{% for evento in eventos %}{{ evento.nome }}'
+    '{% for certificado in evento.meus_certificados %}{{ certificado.imagem_url }}{% endfor %}{% endfor %}'
+)
+
+
+class Command(BaseCommand):
+    help = ('Mede a listagem de "Meus eventos" de um usuário inscrito em muitos eventos, antes e depois '
+            'de anexar o certificado a cada evento. Os dados de teste são descartados ao final.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--eventos', type=int, default=500,
+                            help='Quantidade de eventos em que o usuário está inscrito.')
+
+    def _medir(self, renderizar):
+        with CaptureQueriesContext(connection) as consultas:
+            inicio = perf_counter()
+            renderizar()
+            tempo = perf_counter() - inicio
+        return tempo, len(consultas)
+
+    def handle(self, *args, **options):
+        quantidade = options['eventos']
+
+        with transaction.atomic():
+            usuario = User.objects.create_user(username='benchmark-meus-eventos')
+            eventos = Evento.objects.bulk_create(
+                Evento(criador=usuario, nome=f'Evento {i}', slug=f'benchmark-meus-eventos-{i}', descricao='',
+                       data_inicio='2023-01-01', data_termino='2023-01-02', carga_horaria=8)
+                for i in range(quantidade)
+            )
+            Evento.participantes.through.objects.bulk_create(
+                Evento.participantes.through(evento_id=evento.id, user_id=usuario.id) for evento in eventos)
+            Certificado.objects.bulk_create(Certificado(evento=evento, participante=usuario) for evento in eventos)
+
+            antes = self._medir(lambda: TEMPLATE_ANTIGO.render(Context({
+                'eventos': Evento.objects.filter(participantes__username=usuario),
+                'certificados': Certificado.objects.filter(participante=usuario),
+            })))
+            depois = self._medir(lambda: TEMPLATE_NOVO.render(Context({
+                'eventos': eventos_com_certificado(usuario),
+            })))
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(f'{quantidade} eventos')
+        self.stdout.write(f'Antes:  {antes[0] * 1000:.1f} ms, {antes[1]} consultas')
+        self.stdout.write(f'Depois: {depois[0] * 1000:.1f} ms, {depois[1]} consultas')
+        self.stdout.write(self.style.SUCCESS(f'Ganho: {antes[0] / depois[0]:.2f}x'))
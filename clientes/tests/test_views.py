@@ -1,10 +1,25 @@
+import tempfile
+import unittest
+
 from django.contrib.auth.models import User
 from django.core.files.uploadedfile import SimpleUploadedFile
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from eventos.models import Certificado, Evento
 
 
+def setUpModule():
+    # logos e certificados criados pelos testes, inclusive em setUpTestData, vão para um
+    # MEDIA_ROOT temporário
+    media_root = tempfile.TemporaryDirectory()
+    unittest.addModuleCleanup(media_root.cleanup)
+    settings_override = override_settings(MEDIA_ROOT=media_root.name)
+    settings_override.enable()
+    unittest.addModuleCleanup(settings_override.disable)
+
+
 class MeusEventosViewTestCase(TestCase):
     @classmethod
     def setUpTestData(cls):
@@ -41,9 +56,9 @@ class MeusEventosViewTestCase(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, 'meus_eventos.html')
         self.assertQuerysetEqual(response.context['eventos'], Evento.objects.filter(
-            participantes__username=self.user))
-        self.assertQuerysetEqual(response.context['certificados'], Certificado.objects.filter(
-            participante=self.user))
+            participantes=self.user))
+        self.assertEqual([evento.meus_certificados for evento in response.context['eventos']],
+                         [list(Certificado.objects.filter(participante=self.user))])
 
     def test_meus_eventos_view_with_filter(self):
         self.client.login(username='testuser', password='Password12345')
@@ -59,6 +74,40 @@ class MeusEventosViewTestCase(TestCase):
         self.assertEqual(response.status_code, 302)
         self.assertRedirects(response, '/usuarios/login/?next=/clientes/meus_eventos/')
 
+    def test_each_event_gets_only_the_users_certificate(self):
+        outro = User.objects.create_user(username='outro')
+        evento2 = Evento.objects.create(criador=self.criador, nome='Test Event2', slug='test-event2',
+                                        descricao='d', data_inicio='2023-01-01', data_termino='2023-01-02',
+                                        carga_horaria=8, logo='file.png')
+        evento2.participantes.add(self.user, outro)
+        Certificado.objects.create(participante=outro, evento=evento2)
+        self.client.login(username='testuser', password='Password12345')
+
+        response = self.client.get(self.url)
+
+        certificados = {evento.slug: evento.meus_certificados for evento in response.context['eventos']}
+        self.assertEqual(len(certificados['test-event1']), 1)
+        self.assertEqual(certificados['test-event2'], [])
+        self.assertContains(response, 'Ver certificado', count=1)
+
+    def test_query_count_does_not_depend_on_number_of_events(self):
+        self.client.login(username='testuser', password='Password12345')
+        self.client.get(self.url)
+
+        with CaptureQueriesContext(connection) as um_evento:
+            self.client.get(self.url)
+
+        for i in range(2, 200):
+            evento = Evento.objects.create(criador=self.criador, nome=f'Test Event{i}', slug=f'test-event{i}',
+                                           descricao='d', data_inicio='2023-01-01', data_termino='2023-01-02',
+                                           carga_horaria=8, logo='file.png')
+            evento.participantes.add(self.user)
+            Certificado.objects.create(participante=self.user, evento=evento)
+
+        with self.assertNumQueries(len(um_evento)):
+            response = self.client.get(self.url)
+        self.assertContains(response, 'Ver certificado', count=199)
+
 
 class MeusCertificadosViewTestCase(TestCase):
     @classmethod
@@ -101,6 +150,13 @@ class MeusCertificadosViewTestCase(TestCase):
         response = self.client.get(self.url)
         self.assertQuerysetEqual(response.context['certificados'], Certificado.objects.filter(participante=self.user))
 
+    def test_certificates_link_to_original_image(self):
+        self.client.login(username='testuser', password='Password12345')
+        response = self.client.get(self.url)
+
+        self.assertContains(response, f'href="{self.certificado.template.url}"')
+        self.assertContains(response, 'srcset=')
+
     def test_if_user_is_redirected_to_login_page_if_they_are_not_logged_in(self):
         response = self.client.get(self.url)
 
@@ -1,23 +1,32 @@
 from django.contrib.auth.decorators import login_required
+from django.db.models import Prefetch
 from django.shortcuts import render
 
+from eventos.busca import buscar_eventos
 from eventos.models import Certificado, Evento
 
 
+def eventos_com_certificado(usuario):
+    """
+    eventos em que o usuário está inscrito, cada um com o certificado dele em
+    evento.meus_certificados (lista vazia se ainda não foi emitido), buscados em uma
+    única consulta extra em vez de percorrer todos os certificados a cada evento
+    """
+    return Evento.objects.filter(participantes=usuario).prefetch_related(
+        Prefetch('certificado_set', queryset=Certificado.objects.filter(participante=usuario),
+                 to_attr='meus_certificados')
+    )
+
+
 @login_required(login_url='login')
 def meus_eventos(request):
-    eventos = Evento.objects.filter(participantes__username=request.user)
-    certificados = Certificado.objects.filter(participante=request.user)
+    eventos = eventos_com_certificado(request.user)
     filtro_titulo= request.GET.get('titulo')
 
     if filtro_titulo:
-        eventos = eventos.filter(nome__icontains=filtro_titulo)
+        eventos = buscar_eventos(eventos, filtro_titulo)
 
-    context = {
-        'eventos': eventos,
-        'certificados': certificados
-    }
-    return render(request, 'meus_eventos.html', context)
+    return render(request, 'meus_eventos.html', {'eventos': eventos})
 
 
 @login_required(login_url='login')
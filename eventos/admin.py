@@ -1,14 +1,21 @@
 from django.contrib import admin
 
-from .models import Evento, Certificado
+from .models import Certificado, Evento, ListaEspera, TarefaCertificados
 
 # Register your models here.
 
 
 @admin.register(Evento)
 class EventoAdmin(admin.ModelAdmin):
-    list_display = ('id', 'criador', 'nome', 'data_inicio', 'data_termino')
+    list_display = ('id', 'criador', 'nome', 'data_inicio', 'data_termino', 'capacidade', 'total_participantes')
     prepopulated_fields = {'slug': ('nome',)}
 
 
-admin.site.register(Certificado)
\ No newline at end of file
+admin.site.register(Certificado)
+admin.site.register(ListaEspera)
+
+
+@admin.register(TarefaCertificados)
+class TarefaCertificadosAdmin(admin.ModelAdmin):
+    list_display = ('id', 'evento', 'status', 'processados', 'total', 'criada_em')
+    list_filter = ('status',)
\ No newline at end of file
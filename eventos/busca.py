@@ -0,0 +1,97 @@
+import re
+from functools import lru_cache
+
+from django.db import OperationalError, connection, connections
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+TABELA_BUSCA = 'eventos_evento_busca'
+
+
+def criar_indice(conexao):
+    """
+    cria a tabela FTS5 com o nome e a descrição dos eventos e a preenche. O tokenizador
+    ignora acentos, então "inscricao" encontra "inscrição". Retorna False se o banco
+    não for SQLite ou não tiver o FTS5.
+    """
+    if conexao.vendor != 'sqlite':
+        return False
+
+    with conexao.cursor() as cursor:
+        try:
+            cursor.execute(
+                f'CREATE VIRTUAL TABLE IF NOT EXISTS {TABELA_BUSCA} USING fts5('
+                "nome, descricao, tokenize = 'unicode61 remove_diacritics 2')"
+            )
+        except OperationalError:
+            return False
+        cursor.execute(f'DELETE FROM {TABELA_BUSCA}')
+        cursor.execute(f'INSERT INTO {TABELA_BUSCA} (rowid, nome, descricao) '
+                       'SELECT id, nome, descricao FROM eventos_evento')
+    _indice_existe.cache_clear()
+    return True
+
+
+def remover_indice(conexao):
+    if conexao.vendor == 'sqlite':
+        with conexao.cursor() as cursor:
+            cursor.execute(f'DROP TABLE IF EXISTS {TABELA_BUSCA}')
+        _indice_existe.cache_clear()
+
+
+@lru_cache(maxsize=None)
+def _indice_existe(alias, nome_banco):
+    with connections[alias].cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [TABELA_BUSCA])
+        return cursor.fetchone() is not None
+
+
+def busca_disponivel():
+    """o índice só existe no SQLite com FTS5; a verificação é feita uma vez por banco"""
+    return connection.vendor == 'sqlite' and _indice_existe(connection.alias, str(connection.settings_dict['NAME']))
+
+
+def indexar_evento(evento):
+    if busca_disponivel():
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {TABELA_BUSCA} WHERE rowid = %s', [evento.pk])
+            cursor.execute(f'INSERT INTO {TABELA_BUSCA} (rowid, nome, descricao) VALUES (%s, %s, %s)',
+                           [evento.pk, evento.nome, evento.descricao])
+
+
+def remover_evento(evento_id):
+    if busca_disponivel():
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {TABELA_BUSCA} WHERE rowid = %s', [evento_id])
+
+
+def termos_da_busca(texto):
+    return re.findall(r'\w+', texto)
+
+
+def buscar_eventos(eventos, texto):
+    """
+    filtra o queryset de eventos pelos termos da busca, como prefixos, no nome ou na
+    descrição, ordenando pela relevância (bm25, com o nome valendo mais que a descrição).
+    O FTS5 percorre apenas as linhas que contêm os termos, então o custo acompanha o
+    número de resultados, não o de eventos. Sem FTS5, cai para LIKE em nome e descrição.
+    """
+    termos = termos_da_busca(texto)
+
+    if not termos:
+        return eventos
+
+    if not busca_disponivel():
+        for termo in termos:
+            eventos = eventos.filter(Q(nome__icontains=termo) | Q(descricao__icontains=termo))
+        return eventos.order_by('id')
+
+    # cada termo entre aspas (o texto do usuário nunca vira sintaxe do FTS5) e com * para prefixo
+    consulta = ' '.join(f'"{termo}"*' for termo in termos)
+    # o JOIN com a tabela FTS5 (pelo modelo EventoBusca) permite calcular o bm25 uma vez por
+    # resultado; numa subconsulta correlacionada o FTS5 refaria a busca a cada linha
+    return eventos.filter(busca__isnull=False).filter(
+        RawSQL(f'{TABELA_BUSCA} MATCH %s', [consulta], output_field=BooleanField())
+    ).annotate(
+        relevancia=RawSQL(f'bm25({TABELA_BUSCA}, 10.0, 1.0)', [], output_field=FloatField())
+    ).order_by('relevancia', 'id')
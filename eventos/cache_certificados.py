@@ -0,0 +1,97 @@
+import hashlib
+import json
+import os
+from tempfile import NamedTemporaryFile
+
+from django.conf import settings
+
+from .certificados import formato_certificado, gerar_imagem_certificado
+
+# a remoção desce o cache até esta fração do limite, para que a próxima varredura do
+# diretório só aconteça depois de muitas gravações e não a cada certificado novo
+FRACAO_APOS_REMOCAO = 0.9
+
+# tamanho do cache estimado por este processo, por diretório: o total medido na última
+# varredura mais as imagens gravadas desde então
+_tamanho_estimado = {}
+
+
+def chave_certificado(nome_participante, nome_evento, carga_horaria, formato):
+    """hash das entradas da renderização; certificados com os mesmos dados compartilham o arquivo"""
+    entradas = json.dumps([nome_participante, nome_evento, carga_horaria, formato])
+    return hashlib.sha256(entradas.encode()).hexdigest()
+
+
+def caminho_em_cache(certificado):
+    """
+    retorna o caminho da imagem de um certificado sob demanda, renderizando-o na primeira
+    vez em que é pedido. O mtime dos arquivos registra o último acesso para a remoção LRU.
+    """
+    nome_participante = certificado.participante.username
+    nome_evento = certificado.nome_evento or certificado.evento.nome
+    carga_horaria = certificado.carga_horaria or certificado.evento.carga_horaria
+
+    formato = settings.CERTIFICADOS_FORMATO
+    extensao, _ = formato_certificado(formato)
+
+    chave = chave_certificado(nome_participante, nome_evento, carga_horaria, formato)
+    diretorio = os.path.join(settings.CERTIFICADOS_CACHE_DIR, chave[:2])
+    caminho = os.path.join(diretorio, f'{chave}.{extensao}')
+
+    try:
+        os.utime(caminho)
+        return caminho
+    except FileNotFoundError:
+        pass
+
+    os.makedirs(diretorio, exist_ok=True)
+    imagem = gerar_imagem_certificado(nome_participante, nome_evento, carga_horaria, formato)
+
+    # grava em arquivo temporário e renomeia para que leitores concorrentes nunca vejam uma imagem parcial
+    with NamedTemporaryFile(dir=diretorio, suffix='.tmp', delete=False) as arquivo:
+        arquivo.write(imagem)
+    os.replace(arquivo.name, caminho)
+
+    # o diretório só é percorrido quando a estimativa passa do limite; gravações de outros
+    # processos entram na estimativa na varredura seguinte
+    estimado = _tamanho_estimado.get(settings.CERTIFICADOS_CACHE_DIR)
+    if estimado is None or estimado + len(imagem) > settings.CERTIFICADOS_CACHE_MAX_BYTES:
+        remover_excedentes(manter=caminho, limite=int(settings.CERTIFICADOS_CACHE_MAX_BYTES * FRACAO_APOS_REMOCAO))
+    else:
+        _tamanho_estimado[settings.CERTIFICADOS_CACHE_DIR] = estimado + len(imagem)
+    return caminho
+
+
+def remover_excedentes(manter=None, limite=None):
+    """
+    remove os arquivos acessados há mais tempo até o cache caber em limite
+    (por padrão CERTIFICADOS_CACHE_MAX_BYTES) e atualiza o tamanho estimado
+    """
+    if limite is None:
+        limite = settings.CERTIFICADOS_CACHE_MAX_BYTES
+    arquivos = []
+    total = 0
+
+    for raiz, _, nomes in os.walk(settings.CERTIFICADOS_CACHE_DIR):
+        for nome in nomes:
+            caminho = os.path.join(raiz, nome)
+            try:
+                info = os.stat(caminho)
+            except FileNotFoundError:
+                continue
+            arquivos.append((info.st_mtime, info.st_size, caminho))
+            total += info.st_size
+
+    arquivos.sort()
+    for _, tamanho, caminho in arquivos:
+        if total <= limite:
+            break
+        if caminho == manter:
+            continue
+        try:
+            os.remove(caminho)
+        except FileNotFoundError:
+            pass
+        total -= tamanho
+
+    _tamanho_estimado[settings.CERTIFICADOS_CACHE_DIR] = total
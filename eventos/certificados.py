@@ -0,0 +1,128 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from io import BytesIO
+from multiprocessing import get_context
+
+from django.conf import settings
+from PIL import Image, ImageDraw, ImageFont
+
+COR_TEXTO = (0, 0, 0)
+TAMANHO_FONTE_NOME = 60
+TAMANHO_FONTE_INFO = 30
+
+# formato de saída: (extensão, content type)
+FORMATOS = {
+    'png': ('png', 'image/png'),
+    'png8': ('png', 'image/png'),
+    'webp': ('webp', 'image/webp'),
+    'jpeg': ('jpg', 'image/jpeg'),
+}
+
+
+def caminho_template():
+    return os.path.join(settings.BASE_DIR, 'templates/static/eventos/img/template_certificado.png')
+
+
+def caminho_fonte():
+    return os.path.join(settings.BASE_DIR, 'templates/static/eventos/fonts/arimo.ttf')
+
+
+@lru_cache(maxsize=None)
+def template_base():
+    """decodifica o template do certificado uma única vez por processo"""
+    with Image.open(caminho_template()) as img:
+        return img.copy()
+
+
+@lru_cache(maxsize=None)
+def fonte(tamanho):
+    """carrega a fonte do certificado uma única vez por processo e tamanho"""
+    return ImageFont.truetype(caminho_fonte(), tamanho)
+
+
+def renderizar_certificado(nome_participante, nome_evento, carga_horaria):
+    """desenha os dados do participante sobre uma cópia do template em memória"""
+    img = template_base().copy()
+    draw = ImageDraw.Draw(img)
+    draw.text((230, 651), f'{nome_participante}',
+              font=fonte(TAMANHO_FONTE_NOME), fill=COR_TEXTO)
+    draw.text((761, 782), f'{nome_evento}',
+              font=fonte(TAMANHO_FONTE_INFO), fill=COR_TEXTO)
+    draw.text((816, 849), f'{carga_horaria} horas',
+              font=fonte(TAMANHO_FONTE_INFO), fill=COR_TEXTO)
+    return img
+
+
+def formato_certificado(formato=None):
+    """retorna (extensão, content type) do formato de saída configurado"""
+    return FORMATOS[formato or settings.CERTIFICADOS_FORMATO]
+
+
+def codificar_certificado(img, formato=None, qualidade=None, compressao=None):
+    """codifica a imagem no formato configurado em CERTIFICADOS_FORMATO"""
+    formato = formato or settings.CERTIFICADOS_FORMATO
+    qualidade = settings.CERTIFICADOS_QUALIDADE if qualidade is None else qualidade
+    compressao = settings.CERTIFICADOS_PNG_COMPRESSAO if compressao is None else compressao
+    output = BytesIO()
+
+    if formato == 'png':
+        img.save(output, format='PNG', compress_level=compressao)
+    elif formato == 'png8':
+        # paleta de 256 cores: o certificado tem poucas cores além do anti-aliasing do texto
+        paleta = img.convert('RGB').quantize(colors=256, method=Image.Quantize.FASTOCTREE)
+        paleta.save(output, format='PNG', compress_level=compressao)
+    elif formato == 'webp':
+        img.convert('RGB').save(output, format='WEBP', quality=qualidade)
+    elif formato == 'jpeg':
+        img.convert('RGB').save(output, format='JPEG', quality=qualidade, optimize=True)
+    else:
+        raise ValueError(f'Formato de certificado desconhecido: {formato}')
+
+    return output.getvalue()
+
+
+def gerar_imagem_certificado(nome_participante, nome_evento, carga_horaria, formato=None, qualidade=None,
+                             compressao=None):
+    """renderiza o certificado e retorna os bytes da imagem no formato configurado"""
+    img = renderizar_certificado(nome_participante, nome_evento, carga_horaria)
+    return codificar_certificado(img, formato, qualidade, compressao)
+
+
+def _renderizar_lote(nome_evento, carga_horaria, formato, qualidade, compressao, lote):
+    return [(participante_id,
+             gerar_imagem_certificado(username, nome_evento, carga_horaria, formato, qualidade, compressao))
+            for participante_id, username in lote]
+
+
+def renderizar_certificados(nome_evento, carga_horaria, participantes, workers=None, tamanho_lote=None):
+    """
+    renderiza os certificados de uma lista de (participante_id, username), produzindo
+    (participante_id, bytes da imagem). Os lotes são distribuídos entre processos quando
+    há mais de um worker configurado; o banco de dados fica sempre no processo pai.
+    """
+    workers = workers or settings.CERTIFICADOS_WORKERS
+    tamanho_lote = tamanho_lote or settings.CERTIFICADOS_LOTE
+    participantes = list(participantes)
+    lotes = [participantes[i:i + tamanho_lote] for i in range(0, len(participantes), tamanho_lote)]
+    # as opções de codificação são lidas no processo pai: os workers criados com spawn carregam
+    # as settings do zero e não veem override_settings nem alterações feitas em tempo de execução
+    renderizar = partial(_renderizar_lote, nome_evento, carga_horaria, settings.CERTIFICADOS_FORMATO,
+                         settings.CERTIFICADOS_QUALIDADE, settings.CERTIFICADOS_PNG_COMPRESSAO)
+
+    if workers <= 1 or len(lotes) <= 1:
+        for lote in lotes:
+            yield from renderizar(lote)
+        return
+
+    # spawn evita herdar threads e conexões do processo web via fork
+    with ProcessPoolExecutor(max_workers=min(workers, len(lotes)), mp_context=get_context('spawn')) as executor:
+        # limita os lotes em andamento para que a memória não cresça com o evento
+        pendentes = deque()
+        for lote in lotes:
+            pendentes.append(executor.submit(renderizar, lote))
+            if len(pendentes) >= workers * 2:
+                yield from pendentes.popleft().result()
+        while pendentes:
+            yield from pendentes.popleft().result()
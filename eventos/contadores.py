@@ -0,0 +1,33 @@
+from django.db.models import Count, Exists, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from .models import Certificado, Evento
+
+
+def _contagem(queryset):
+    return Coalesce(Subquery(
+        queryset.filter(evento_id=OuterRef('pk')).order_by().values('evento_id')
+        .annotate(total=Count('*')).values('total')
+    ), 0)
+
+
+def certificados_dos_usuarios(usuarios):
+    """
+    quantidade de certificados do evento emitidos para os usuários, como expressão para o
+    UPDATE dos contadores; quem cancela ou volta ao evento leva o seu certificado junto
+    """
+    return _contagem(Certificado.objects.filter(participante_id__in=usuarios))
+
+
+def recalcular_contadores(eventos=None):
+    """
+    recalcula os contadores dos eventos com um único UPDATE; retorna a quantidade de eventos.
+    total_certificados conta apenas os certificados de quem ainda é participante.
+    """
+    eventos = Evento.objects.all() if eventos is None else eventos
+    Participacao = Evento.participantes.through
+    return eventos.update(
+        total_participantes=_contagem(Participacao.objects.all()),
+        total_certificados=_contagem(Certificado.objects.filter(Exists(Participacao.objects.filter(
+            evento_id=OuterRef('evento_id'), user_id=OuterRef('participante_id'))))),
+    )
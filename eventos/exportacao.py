@@ -0,0 +1,267 @@
+import csv
+import hashlib
+import json
+import os
+import zipfile
+from glob import glob
+from io import BytesIO
+from tempfile import NamedTemporaryFile
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, Max, Sum
+from PIL import Image
+
+from .cache_certificados import caminho_em_cache
+from .certificados import template_base
+from .models import Certificado
+
+TAMANHO_PEDACO = 64 * 1024
+
+
+class _Eco:
+    """pseudo-arquivo que devolve o que o csv.writer escreve, sem guardar nada"""
+
+    def write(self, valor):
+        return valor
+
+
+class _BufferDeEscrita:
+    """arquivo somente de escrita que guarda os bytes até o gerador da resposta consumi-los"""
+
+    def __init__(self):
+        self.partes = []
+
+    def write(self, dados):
+        self.partes.append(bytes(dados))
+        return len(dados)
+
+    def flush(self):
+        pass
+
+    def esvaziar(self):
+        dados = b''.join(self.partes)
+        self.partes.clear()
+        return dados
+
+
+def abrir_imagem_certificado(certificado):
+    """
+    abre o arquivo da imagem do certificado, renderizando-o se for sob demanda,
+    e retorna (arquivo, extensão)
+    """
+    if certificado.template:
+        caminho = certificado.template.name
+        arquivo = certificado.template.open('rb')
+    else:
+        caminho = caminho_em_cache(certificado)
+        arquivo = open(caminho, 'rb')
+
+    _, extensao = os.path.splitext(caminho)
+    return arquivo, extensao
+
+
+def zip_certificados(certificados):
+    """
+    gera um ZIP com as imagens dos certificados em pedaços de bytes, sem montar o arquivo
+    em memória ou em disco. As imagens já são comprimidas, então as entradas são gravadas
+    sem compressão (ZIP_STORED); o zipfile usa data descriptors porque a saída não é seekable.
+    """
+    buffer = _BufferDeEscrita()
+
+    with zipfile.ZipFile(buffer, mode='w', compression=zipfile.ZIP_STORED) as arquivo_zip:
+        for certificado in certificados:
+            origem, extensao = abrir_imagem_certificado(certificado)
+            with origem, arquivo_zip.open(f'{certificado.participante.username}{extensao}', mode='w') as destino:
+                while pedaco := origem.read(TAMANHO_PEDACO):
+                    destino.write(pedaco)
+                    yield buffer.esvaziar()
+
+    # diretório central, gravado ao fechar o ZipFile
+    yield buffer.esvaziar()
+
+
+class _EscritorPdf:
+    """
+    escreve um PDF com uma imagem JPEG por página, uma página por vez, sem reler o arquivo.
+    Só as posições dos objetos ficam em memória; o catálogo é o objeto 1, a árvore de
+    páginas (gravada no fim, quando as páginas são conhecidas) é o 2 e cada página ocupa
+    três objetos: a imagem, o conteúdo e a própria página.
+    """
+
+    def __init__(self, arquivo, resolucao):
+        self.arquivo = arquivo
+        self.resolucao = resolucao
+        self.posicoes = {}
+        self.paginas = []
+        arquivo.write(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+        self._objeto(1, b'<< /Type /Catalog /Pages 2 0 R >>')
+
+    def _objeto(self, numero, dicionario, stream=None):
+        self.posicoes[numero] = self.arquivo.tell()
+        self.arquivo.write(b'%d 0 obj\n' % numero + dicionario)
+        if stream is not None:
+            self.arquivo.write(b'\nstream\n' + stream + b'\nendstream')
+        self.arquivo.write(b'\nendobj\n')
+
+    def adicionar_pagina(self, img):
+        imagem = 3 + 3 * len(self.paginas)
+        jpeg = BytesIO()
+        img.convert('RGB').save(jpeg, format='JPEG')
+        dados = jpeg.getvalue()
+        largura = img.width * 72 / self.resolucao
+        altura = img.height * 72 / self.resolucao
+        conteudo = b'q %f 0 0 %f 0 0 cm /image Do Q\n' % (largura, altura)
+
+        self._objeto(imagem, b'<< /Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace /DeviceRGB '
+                             b'/BitsPerComponent 8 /Filter /DCTDecode /Length %d >>'
+                     % (img.width, img.height, len(dados)), dados)
+        self._objeto(imagem + 1, b'<< /Length %d >>' % len(conteudo), conteudo)
+        self._objeto(imagem + 2, b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %f %f] '
+                                 b'/Resources << /XObject << /image %d 0 R >> >> /Contents %d 0 R >>'
+                     % (largura, altura, imagem, imagem + 1))
+        self.paginas.append(imagem + 2)
+
+    def fechar(self):
+        paginas = b' '.join(b'%d 0 R' % numero for numero in self.paginas)
+        self._objeto(2, b'<< /Type /Pages /Count %d /Kids [%s] >>' % (len(self.paginas), paginas))
+
+        inicio_xref = self.arquivo.tell()
+        total = len(self.posicoes) + 1
+        self.arquivo.write(b'xref\n0 %d\n0000000000 65535 f \n' % total)
+        for numero in range(1, total):
+            self.arquivo.write(b'%010d 00000 n \n' % self.posicoes[numero])
+        self.arquivo.write(b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (total, inicio_xref))
+
+
+def _gravar_pdf(certificados, caminho, ao_progredir=None):
+    """
+    grava o PDF em uma única passada: cada certificado é aberto, escrito como uma página e
+    fechado antes do próximo. ao_progredir(quantidade) é chamado a cada CERTIFICADOS_PDF_LOTE
+    páginas.
+    """
+    resolucao = template_base().info.get('dpi', (72, 72))[0]
+    gravadas = 0
+
+    with open(caminho, 'wb') as arquivo:
+        pdf = _EscritorPdf(arquivo, resolucao)
+        for certificado in certificados:
+            origem, _ = abrir_imagem_certificado(certificado)
+            with origem, Image.open(origem) as img:
+                pdf.adicionar_pagina(img)
+
+            gravadas += 1
+            if ao_progredir and gravadas == settings.CERTIFICADOS_PDF_LOTE:
+                ao_progredir(gravadas)
+                gravadas = 0
+        pdf.fechar()
+
+    if ao_progredir and gravadas:
+        ao_progredir(gravadas)
+
+
+def caminho_pdf_certificados(evento):
+    """
+    retorna o caminho do PDF com o conjunto atual de certificados do evento, exista o
+    arquivo ou não, ou None se não houver certificados
+    """
+    resumo = Certificado.objects.filter(evento=evento).aggregate(
+        quantidade=Count('id'), maior=Max('id'), soma=Sum('id'))
+
+    if not resumo['quantidade']:
+        return None
+
+    assinatura = hashlib.sha256(json.dumps(resumo, sort_keys=True).encode()).hexdigest()[:16]
+    return os.path.join(settings.CERTIFICADOS_PDF_DIR, f'{evento.id}-{assinatura}.pdf')
+
+
+def pdf_certificados(evento, ao_progredir=None):
+    """
+    monta o PDF com todos os certificados do evento, se ainda não estiver em cache, e
+    retorna o seu caminho. Roda no worker da fila: com certificados sob demanda isso
+    renderiza o evento inteiro.
+    """
+    caminho = caminho_pdf_certificados(evento)
+
+    if not caminho or os.path.exists(caminho):
+        return caminho
+
+    os.makedirs(settings.CERTIFICADOS_PDF_DIR, exist_ok=True)
+    with NamedTemporaryFile(dir=settings.CERTIFICADOS_PDF_DIR, suffix='.tmp', delete=False) as arquivo:
+        temporario = arquivo.name
+
+    try:
+        certificados = Certificado.objects.filter(evento=evento).select_related('evento', 'participante')
+        _gravar_pdf(certificados.order_by('id').iterator(chunk_size=500), temporario, ao_progredir)
+    except Exception:
+        os.remove(temporario)
+        raise
+
+    os.replace(temporario, caminho)
+
+    # remove as versões anteriores do PDF deste evento; quem já abriu uma delas continua
+    # lendo o arquivo aberto, e a view trata o arquivo que some antes de ser aberto
+    for antigo in glob(os.path.join(settings.CERTIFICADOS_PDF_DIR, f'{evento.id}-*.pdf')):
+        if antigo != caminho:
+            try:
+                os.remove(antigo)
+            except FileNotFoundError:
+                pass
+    return caminho
+
+
+# formatos de exportação de participantes: (extensão, content type)
+FORMATOS_EXPORTACAO = {
+    'csv': ('csv', 'text/csv; charset=utf-8'),
+    'tsv': ('tsv', 'text/tab-separated-values; charset=utf-8'),
+    'jsonl': ('jsonl', 'application/x-ndjson'),
+}
+COLUNAS_EXPORTACAO = ('id', 'username', 'email', 'first_name', 'last_name', 'date_joined')
+COLUNAS_PADRAO = ('username', 'email')
+
+
+def _agrupar(textos):
+    """agrupa os textos em pedaços de ~TAMANHO_PEDACO para não gerar um chunk HTTP por linha"""
+    pedaco = []
+    tamanho = 0
+
+    for texto in textos:
+        pedaco.append(texto)
+        tamanho += len(texto)
+        if tamanho >= TAMANHO_PEDACO:
+            yield ''.join(pedaco)
+            pedaco.clear()
+            tamanho = 0
+
+    if pedaco:
+        yield ''.join(pedaco)
+
+
+def _linhas_delimitadas(linhas, colunas, cabecalho, delimitador):
+    writer = csv.writer(_Eco(), delimiter=delimitador)
+    if cabecalho:
+        yield writer.writerow(colunas)
+    for linha in linhas:
+        yield writer.writerow(linha)
+
+
+def _linhas_json(linhas, colunas):
+    for linha in linhas:
+        yield json.dumps(dict(zip(colunas, linha)), cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
+
+def serializar_participantes(linhas, formato='csv', colunas=COLUNAS_PADRAO, cabecalho=False):
+    """
+    serializa tuplas de um values_list no formato pedido, em pedaços de texto.
+    O cabeçalho só se aplica a CSV e TSV; no JSON Lines as colunas são as chaves.
+    """
+    if formato == 'csv':
+        textos = _linhas_delimitadas(linhas, colunas, cabecalho, ',')
+    elif formato == 'tsv':
+        textos = _linhas_delimitadas(linhas, colunas, cabecalho, '\t')
+    elif formato == 'jsonl':
+        textos = _linhas_json(linhas, colunas)
+    else:
+        raise ValueError(f'Formato de exportação desconhecido: {formato}')
+
+    return _agrupar(textos)
@@ -0,0 +1,185 @@
+import codecs
+import csv
+from itertools import islice
+from secrets import token_urlsafe
+
+from django.conf import settings
+from django.contrib.auth.hashers import UNUSABLE_PASSWORD_PREFIX
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Lower
+
+from .contadores import recalcular_contadores
+from .inscricoes import reservar_vagas
+from .models import Evento, ListaEspera
+
+# linhas ignoradas guardadas no relatório; as demais só entram na contagem
+LIMITE_RELATORIO = 1000
+
+
+class RelatorioImportacao:
+    def __init__(self):
+        self.inscritos = 0
+        self.usuarios_criados = 0
+        self.total_ignoradas = 0
+        self.ignoradas = []
+
+    def ignorar(self, linha, email, motivo):
+        self.total_ignoradas += 1
+        if len(self.ignoradas) < LIMITE_RELATORIO:
+            self.ignoradas.append((linha, email, motivo))
+
+
+def ler_linhas(arquivo):
+    """
+    lê o CSV enviado linha a linha, sem carregá-lo inteiro, produzindo (número da linha, dados).
+    Com cabeçalho, as colunas são lidas pelo nome (email, username, first_name, last_name);
+    sem cabeçalho, a ordem é a mesma da exportação: username, email.
+    """
+    leitor = csv.reader(codecs.iterdecode(arquivo, 'utf-8-sig'))
+    colunas = ['username', 'email']
+
+    for linha in leitor:
+        if not any(linha):
+            continue
+        if leitor.line_num == 1 and 'email' in (valor.strip().lower() for valor in linha):
+            colunas = [valor.strip().lower() for valor in linha]
+            continue
+        yield leitor.line_num, dict(zip(colunas, (valor.strip() for valor in linha)))
+
+
+def _nome_de_usuario_valido(username):
+    try:
+        User.username_validator(username)
+    except ValidationError:
+        return False
+    return len(username) <= User._meta.get_field('username').max_length
+
+
+def _importar_lote(evento, lote, relatorio):
+    Participacao = Evento.participantes.through
+    validas = {}
+
+    for numero, dados in lote:
+        email = dados.get('email', '').lower()
+        try:
+            validate_email(email)
+        except ValidationError:
+            relatorio.ignorar(numero, email, 'e-mail inválido')
+            continue
+        # só o lote é guardado em memória; um e-mail repetido em outro lote já está inscrito
+        if email in validas:
+            relatorio.ignorar(numero, email, 'e-mail repetido no arquivo')
+            continue
+        validas[email] = (numero, dados)
+
+    if not validas:
+        return
+
+    # o e-mail é comparado sem diferenciar maiúsculas; com email > '' a consulta usa o
+    # índice único de LOWER(email) criado em usuarios/migrations/0001_email_unico.py
+    existentes = dict(User.objects.annotate(email_normalizado=Lower('email')).filter(
+        email_normalizado__in=validas.keys(), email__gt='').values_list('email_normalizado', 'id'))
+
+    # novos usuários: o username do arquivo ou, se não houver ou já estiver em uso, o e-mail
+    faltantes = [email for email in validas if email not in existentes]
+    candidatos = {}
+    for email in faltantes:
+        _, dados = validas[email]
+        opcoes = [dados.get('username', ''), email]
+        candidatos[email] = [nome for nome in opcoes if nome and _nome_de_usuario_valido(nome)]
+
+    em_uso = set(User.objects.filter(
+        username__in={nome for opcoes in candidatos.values() for nome in opcoes}
+    ).values_list('username', flat=True)) if candidatos else set()
+
+    novos = []
+    for email in faltantes:
+        numero, dados = validas[email]
+        username = next((nome for nome in candidatos[email] if nome not in em_uso), None)
+        if username is None:
+            relatorio.ignorar(numero, email, 'nome de usuário indisponível')
+            del validas[email]
+            continue
+        em_uso.add(username)
+        novos.append(User(
+            username=username,
+            email=email,
+            first_name=dados.get('first_name', '')[:150],
+            last_name=dados.get('last_name', '')[:150],
+            # o mesmo formato de make_password(None), sem o custo do get_random_string por usuário
+            password=UNUSABLE_PASSWORD_PREFIX + token_urlsafe(30)
+        ))
+
+    with transaction.atomic():
+        if novos:
+            # ignore_conflicts cobre o e-mail ou o username cadastrados por outra requisição
+            # depois da consulta acima; os usuários são relidos pelo e-mail e só os que têm o
+            # username escolhido aqui contam como criados pela importação
+            User.objects.bulk_create(novos, ignore_conflicts=True)
+            escolhidos = {usuario.email: usuario.username for usuario in novos}
+            for email, username, user_id in User.objects.annotate(email_normalizado=Lower('email')).filter(
+                    email_normalizado__in=escolhidos.keys(), email__gt='').values_list(
+                    'email_normalizado', 'username', 'id'):
+                existentes[email] = user_id
+                relatorio.usuarios_criados += username == escolhidos[email]
+
+            for email in escolhidos.keys() - existentes.keys():
+                numero, _ = validas.pop(email)
+                relatorio.ignorar(numero, email, 'nome de usuário indisponível')
+
+        usuarios = [existentes[email] for email in validas]
+        ja_inscritos = set(Participacao.objects.filter(
+            evento_id=evento.id, user_id__in=usuarios).values_list('user_id', flat=True))
+
+        # as vagas são ocupadas no contador do evento, como em inscrever(), para que as
+        # inscrições feitas durante a importação vejam as vagas já tomadas pelos lotes anteriores
+        vagas = reservar_vagas(evento, len(set(usuarios) - ja_inscritos))
+
+        inscricoes = []
+        for email, (numero, _) in validas.items():
+            user_id = existentes[email]
+            if user_id in ja_inscritos:
+                relatorio.ignorar(numero, email, 'já inscrito')
+            elif len(inscricoes) >= vagas:
+                relatorio.ignorar(numero, email, 'evento lotado')
+            else:
+                inscricoes.append(Participacao(evento_id=evento.id, user_id=user_id))
+
+        # ignore_conflicts cobre inscrições feitas por outra requisição durante a importação;
+        # as linhas descartadas devolvem a vaga reservada
+        do_lote = Participacao.objects.filter(evento_id=evento.id, user_id__in=usuarios)
+        antes = do_lote.count()
+        Participacao.objects.bulk_create(inscricoes, ignore_conflicts=True)
+        inseridas = do_lote.count() - antes
+        if inseridas < vagas:
+            Evento.objects.filter(pk=evento.pk).update(
+                total_participantes=F('total_participantes') - (vagas - inseridas))
+        relatorio.inscritos += inseridas
+
+        # quem estava na lista de espera e foi inscrito pela importação sai dela
+        ListaEspera.objects.filter(
+            evento_id=evento.id, participante_id__in=[inscricao.user_id for inscricao in inscricoes]).delete()
+
+
+def importar_participantes(evento, arquivo, tamanho_lote=None):
+    """
+    inscreve no evento os participantes de um CSV, em lotes de IMPORTACAO_LOTE linhas.
+    Cada lote busca os usuários existentes pelo e-mail com um único IN, cria os que faltam
+    com bulk_create (sem senha utilizável) e grava as inscrições em lote. Só o lote atual
+    fica em memória. Retorna um RelatorioImportacao com as linhas ignoradas e o motivo.
+    """
+    tamanho_lote = tamanho_lote or settings.IMPORTACAO_LOTE
+    relatorio = RelatorioImportacao()
+    linhas = ler_linhas(arquivo)
+
+    while lote := list(islice(linhas, tamanho_lote)):
+        _importar_lote(evento, lote, relatorio)
+
+    # bulk_create não dispara m2m_changed; os lotes mantêm total_participantes e o
+    # recálculo no fim traz os certificados de quem volta ao evento
+    recalcular_contadores(Evento.objects.filter(pk=evento.pk))
+    return relatorio
@@ -0,0 +1,122 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, F, OuterRef, Q
+
+from .contadores import certificados_dos_usuarios
+from .models import Evento, ListaEspera
+
+INSCRITO = 'inscrito'
+JA_INSCRITO = 'ja_inscrito'
+EM_ESPERA = 'em_espera'
+
+
+def _reservar_vaga(evento, usuario_id):
+    """
+    ocupa uma vaga com um UPDATE condicional no contador do evento. Como a condição é
+    avaliada pelo banco junto com a escrita, duas inscrições simultâneas nunca ocupam a
+    mesma vaga, e nenhuma delas precisa contar os participantes. O certificado de quem
+    cancelou e voltou ao evento volta a contar no mesmo UPDATE.
+    """
+    return Evento.objects.filter(pk=evento.pk).filter(
+        Q(capacidade__isnull=True) | Q(total_participantes__lt=F('capacidade'))
+    ).update(total_participantes=F('total_participantes') + 1,
+             total_certificados=F('total_certificados') + certificados_dos_usuarios([usuario_id]))
+
+
+def reservar_vagas(evento, quantidade):
+    """
+    ocupa até `quantidade` vagas de uma vez, com o mesmo UPDATE condicional de _reservar_vaga,
+    e retorna quantas foram ocupadas. Se outra inscrição ocupar vagas entre a leitura do
+    contador e o UPDATE, a condição falha e a reserva é refeita com o novo total.
+    """
+    while quantidade > 0:
+        capacidade, ocupadas = Evento.objects.values_list('capacidade', 'total_participantes').get(pk=evento.pk)
+        if capacidade is not None:
+            quantidade = min(quantidade, capacidade - ocupadas)
+            if quantidade <= 0:
+                break
+
+        if Evento.objects.filter(pk=evento.pk).filter(
+            Q(capacidade__isnull=True) | Q(total_participantes__lte=F('capacidade') - quantidade)
+        ).update(total_participantes=F('total_participantes') + quantidade):
+            return quantidade
+
+    return 0
+
+
+def inscrever(evento, usuario):
+    """
+    inscreve o usuário no evento ou, se não houver vaga, o coloca na lista de espera.
+    A restrição única (evento, usuário) do banco descarta inscrições repetidas, inclusive
+    concorrentes. Quem estava na lista de espera sai dela na mesma transação da inscrição.
+    Retorna INSCRITO, JA_INSCRITO ou EM_ESPERA.
+    """
+    Participacao = Evento.participantes.through
+
+    try:
+        with transaction.atomic():
+            if _reservar_vaga(evento, usuario.id):
+                Participacao.objects.create(evento_id=evento.id, user_id=usuario.id)
+                ListaEspera.objects.filter(evento_id=evento.id, participante_id=usuario.id).delete()
+                return INSCRITO
+    except IntegrityError:
+        # a transação desfaz a reserva da vaga
+        return JA_INSCRITO
+
+    if evento.participantes.filter(pk=usuario.pk).exists():
+        return JA_INSCRITO
+
+    try:
+        with transaction.atomic():
+            ListaEspera.objects.create(evento_id=evento.id, participante_id=usuario.id)
+    except IntegrityError:
+        pass
+
+    return EM_ESPERA
+
+
+def promover_lista_espera(evento):
+    """
+    passa as vagas livres do evento para a lista de espera, por ordem de chegada, e retorna
+    os ids dos promovidos. É chamada pelo sinal m2m_changed a cada remoção de participantes,
+    seja pelo cancelamento, pelo admin ou por participantes.remove()/clear().
+    """
+    Participacao = Evento.participantes.through
+    # quem já está inscrito não é promovido, mesmo que ainda tenha uma linha na lista
+    espera = ListaEspera.objects.filter(evento_id=evento.id).exclude(Exists(Participacao.objects.filter(
+        evento_id=OuterRef('evento_id'), user_id=OuterRef('participante_id')))).order_by('id')
+    promovidos = []
+
+    while proximo := espera.first():
+        try:
+            with transaction.atomic():
+                # outra promoção simultânea pode ter levado o mesmo usuário; tenta o seguinte
+                removidos, _ = ListaEspera.objects.filter(id=proximo.id).delete()
+                if not removidos:
+                    continue
+                if not _reservar_vaga(evento, proximo.participante_id):
+                    # sem vaga livre: desfaz a remoção e o usuário continua na lista
+                    transaction.set_rollback(True)
+                    break
+                Participacao.objects.create(evento_id=evento.id, user_id=proximo.participante_id)
+        except IntegrityError:
+            # inscrito por outra requisição depois da consulta; a consulta seguinte o exclui
+            continue
+        promovidos.append(proximo.participante_id)
+
+    return promovidos
+
+
+def cancelar_inscricao(evento, usuario):
+    """
+    cancela a inscrição (ou a posição na lista de espera) do usuário. A remoção passa pelo
+    related manager: o sinal m2m_changed recalcula os contadores e passa a vaga liberada para
+    o primeiro da lista de espera (veja promover_lista_espera). Retorna False se o usuário
+    não estava inscrito nem na lista de espera.
+    """
+    with transaction.atomic():
+        if evento.participantes.filter(pk=usuario.pk).exists():
+            evento.participantes.remove(usuario)
+            return True
+
+        removidos, _ = ListaEspera.objects.filter(evento_id=evento.id, participante_id=usuario.id).delete()
+        return bool(removidos)
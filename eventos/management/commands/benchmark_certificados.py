@@ -0,0 +1,68 @@
+from io import BytesIO
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from PIL import Image, ImageDraw, ImageFont
+
+from eventos.certificados import (caminho_fonte, caminho_template, fonte,
+                                  gerar_imagem_certificado, renderizar_certificados,
+                                  template_base)
+
+
+def _gerar_sem_cache(nome_participante, nome_evento, carga_horaria):
+    """implementação antiga: reabre o template e as fontes a cada certificado"""
+    img = Image.open(caminho_template())
+    draw = ImageDraw.Draw(img)
+    fonte_nome = ImageFont.truetype(caminho_fonte(), 60)
+    fonte_info = ImageFont.truetype(caminho_fonte(), 30)
+    draw.text((230, 651), f'{nome_participante}', font=fonte_nome, fill=(0, 0, 0))
+    draw.text((761, 782), f'{nome_evento}', font=fonte_info, fill=(0, 0, 0))
+    draw.text((816, 849), f'{carga_horaria} horas', font=fonte_info, fill=(0, 0, 0))
+    output = BytesIO()
+    img.save(output, format='PNG')
+    return output.getvalue()
+
+
+class Command(BaseCommand):
+    help = ('Mede o tempo de renderização de um certificado antes e depois do cache do template e das fontes '
+            'e, opcionalmente, a vazão da renderização em lote com vários processos.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--quantidade', type=int, default=50,
+                            help='Quantidade de certificados renderizados em cada cenário.')
+        parser.add_argument('--workers', type=int, nargs='*', default=[],
+                            help='Quantidades de processos a comparar na renderização em lote (ex.: 1 2 4).')
+        parser.add_argument('--lote', type=int, default=10,
+                            help='Quantidade de certificados por lote enviado a cada processo.')
+
+    def _medir(self, gerar, quantidade):
+        inicio = perf_counter()
+        for i in range(quantidade):
+            gerar(f'participante{i}', 'Evento de benchmark', 8)
+        return (perf_counter() - inicio) / quantidade
+
+    def handle(self, *args, **options):
+        quantidade = options['quantidade']
+
+        antes = self._medir(_gerar_sem_cache, quantidade)
+
+        # aquece o cache para medir apenas o custo por certificado
+        template_base()
+        fonte(60)
+        fonte(30)
+        depois = self._medir(gerar_imagem_certificado, quantidade)
+
+        self.stdout.write(f'Sem cache: {antes * 1000:.2f} ms por certificado')
+        self.stdout.write(f'Com cache: {depois * 1000:.2f} ms por certificado')
+        self.stdout.write(self.style.SUCCESS(f'Ganho: {antes / depois:.2f}x'))
+
+        participantes = [(i, f'participante{i}') for i in range(quantidade)]
+        base = None
+        for workers in options['workers']:
+            inicio = perf_counter()
+            for _ in renderizar_certificados('Evento de benchmark', 8, participantes,
+                                             workers=workers, tamanho_lote=options['lote']):
+                pass
+            vazao = quantidade / (perf_counter() - inicio)
+            base = base or vazao
+            self.stdout.write(f'{workers} worker(s): {vazao:.1f} certificados/s ({vazao / base:.2f}x)')
@@ -0,0 +1,41 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+
+from eventos.certificados import codificar_certificado, renderizar_certificado
+
+CENARIOS = (
+    ('png', {'compressao': 1}),
+    ('png', {'compressao': 6}),
+    ('png', {'compressao': 9}),
+    ('png8', {'compressao': 6}),
+    ('png8', {'compressao': 9}),
+    ('webp', {'qualidade': 75}),
+    ('webp', {'qualidade': 85}),
+    ('webp', {'qualidade': 95}),
+    ('jpeg', {'qualidade': 75}),
+    ('jpeg', {'qualidade': 85}),
+    ('jpeg', {'qualidade': 95}),
+)
+
+
+class Command(BaseCommand):
+    help = 'Mede o tempo de codificação e o tamanho de um certificado em cada formato de saída.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeticoes', type=int, default=5,
+                            help='Quantidade de codificações medidas em cada cenário.')
+
+    def handle(self, *args, **options):
+        repeticoes = options['repeticoes']
+        img = renderizar_certificado('Participante de benchmark', 'Evento de benchmark', 8)
+
+        self.stdout.write(f'{"formato":<8} {"nível":<14} {"ms/certificado":>15} {"KB":>10}')
+        for formato, parametros in CENARIOS:
+            inicio = perf_counter()
+            for _ in range(repeticoes):
+                conteudo = codificar_certificado(img, formato, **parametros)
+            tempo = (perf_counter() - inicio) / repeticoes
+
+            nivel = ', '.join(f'{nome}={valor}' for nome, valor in parametros.items())
+            self.stdout.write(f'{formato:<8} {nivel:<14} {tempo * 1000:>15.1f} {len(conteudo) / 1024:>10.1f}')
@@ -0,0 +1,36 @@
+from time import sleep
+
+from django.core.management.base import BaseCommand
+
+from eventos.models import TarefaCertificados
+from eventos.tarefas import executar_tarefa, reservar_proxima_tarefa
+
+
+class Command(BaseCommand):
+    help = 'Worker que processa a fila de geração de certificados.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true',
+                            help='Processa as tarefas pendentes e encerra quando a fila estiver vazia.')
+        parser.add_argument('--intervalo', type=float, default=2.0,
+                            help='Segundos de espera entre consultas quando a fila está vazia.')
+
+    def handle(self, *args, **options):
+        while True:
+            tarefa = reservar_proxima_tarefa()
+
+            if tarefa is None:
+                if options['once']:
+                    return
+                sleep(options['intervalo'])
+                continue
+
+            self.stdout.write(f'{tarefa.get_tipo_display()} do evento "{tarefa.evento.nome}"...')
+            tarefa = executar_tarefa(tarefa)
+
+            if tarefa.status == TarefaCertificados.ERRO:
+                self.stderr.write(f'Erro ao gerar certificados: {tarefa.erro}')
+            elif tarefa.status == TarefaCertificados.PROCESSANDO:
+                self.stderr.write('A tarefa foi retomada por outro worker; execução interrompida.')
+            else:
+                self.stdout.write(self.style.SUCCESS(f'{tarefa.total} certificado(s) processado(s).'))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from eventos.contadores import recalcular_contadores
+from eventos.models import Evento
+
+
+class Command(BaseCommand):
+    help = 'Recalcula os contadores de participantes e certificados dos eventos.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('slugs', nargs='*', help='Slugs dos eventos; todos se omitido.')
+
+    def handle(self, *args, **options):
+        eventos = Evento.objects.all()
+        if options['slugs']:
+            eventos = eventos.filter(slug__in=options['slugs'])
+
+        quantidade = recalcular_contadores(eventos)
+        self.stdout.write(self.style.SUCCESS(f'Contadores de {quantidade} evento(s) recalculados.'))
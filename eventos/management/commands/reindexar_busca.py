@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from eventos.busca import criar_indice
+
+
+class Command(BaseCommand):
+    help = ('Reconstrói o índice de busca (FTS5) dos eventos, por exemplo após alterações feitas '
+            'com update() ou direto no banco, que não disparam os signals.')
+
+    def handle(self, *args, **options):
+        if criar_indice(connection):
+            self.stdout.write(self.style.SUCCESS('Índice de busca reconstruído.'))
+        else:
+            self.stdout.write(self.style.WARNING('O banco não suporta FTS5; a busca usa LIKE.'))
@@ -0,0 +1,27 @@
+# Generated by Django 4.2 on 2026-10-18 10:36
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventos', '0006_rename_partipante_certificado_participante'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TarefaCertificados',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pendente', 'Pendente'), ('processando', 'Processando'), ('concluida', 'Concluída'), ('erro', 'Erro')], db_index=True, default='pendente', max_length=11)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('processados', models.PositiveIntegerField(default=0)),
+                ('erro', models.TextField(blank=True)),
+                ('criada_em', models.DateTimeField(auto_now_add=True)),
+                ('atualizada_em', models.DateTimeField(auto_now=True)),
+                ('evento', models.ForeignKey(on_delete=django.db.models.deletion.DO_NOTHING, to='eventos.evento')),
+            ],
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2 on 2026-10-18 10:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventos', '0007_tarefacertificados'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='certificado',
+            name='carga_horaria',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='certificado',
+            name='nome_evento',
+            field=models.CharField(blank=True, max_length=200),
+        ),
+        migrations.AlterField(
+            model_name='certificado',
+            name='template',
+            field=models.ImageField(blank=True, upload_to='certificados'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 4.2 on 2026-10-18 10:51
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+import django.db.models.deletion
+
+
+def preencher_total_participantes(apps, schema_editor):
+    Evento = apps.get_model('eventos', 'Evento')
+    Participacao = Evento.participantes.through
+    total = Participacao.objects.filter(
+        evento_id=models.OuterRef('pk')).order_by().values('evento_id').annotate(total=models.Count('*')).values('total')
+    Evento.objects.update(total_participantes=Coalesce(models.Subquery(total), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('eventos', '0008_certificado_sob_demanda'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evento',
+            name='capacidade',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='evento',
+            name='total_participantes',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(preencher_total_participantes, migrations.RunPython.noop),
+        migrations.CreateModel(
+            name='ListaEspera',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('criada_em', models.DateTimeField(auto_now_add=True)),
+                ('evento', models.ForeignKey(on_delete=django.db.models.deletion.DO_NOTHING, to='eventos.evento')),
+                ('participante', models.ForeignKey(on_delete=django.db.models.deletion.DO_NOTHING, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='listaespera',
+            constraint=models.UniqueConstraint(fields=('evento', 'participante'), name='lista_espera_unica'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2 on 2026-10-18 10:55
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def preencher_total_certificados(apps, schema_editor):
+    # conta só os certificados de quem ainda é participante, como eventos/contadores.py
+    Evento = apps.get_model('eventos', 'Evento')
+    Certificado = apps.get_model('eventos', 'Certificado')
+    Participacao = Evento.participantes.through
+    participante = models.Exists(Participacao.objects.filter(
+        evento_id=models.OuterRef('evento_id'), user_id=models.OuterRef('participante_id')))
+    total = Certificado.objects.filter(participante, evento_id=models.OuterRef('pk')).order_by().values(
+        'evento_id').annotate(total=models.Count('*')).values('total')
+    Evento.objects.update(total_certificados=Coalesce(models.Subquery(total), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventos', '0009_capacidade_lista_espera'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evento',
+            name='total_certificados',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(preencher_total_certificados, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventos', '0010_total_certificados'),
+    ]
+
+    operations = [
+        # paginação por keyset: WHERE evento_id = ? AND id > ? ORDER BY id
+        migrations.RunSQL(
+            'CREATE INDEX eventos_participantes_evento_id_id_idx ON eventos_evento_participantes (evento_id, id);',
+            'DROP INDEX eventos_participantes_evento_id_id_idx;',
+        ),
+    ]
@@ -0,0 +1,35 @@
+from django.db import OperationalError, migrations
+
+
+def criar_indice_busca(apps, schema_editor):
+    # FTS5 existe apenas no SQLite (e só se compilado com ele); nos demais bancos a busca usa LIKE
+    conexao = schema_editor.connection
+    if conexao.vendor != 'sqlite':
+        return
+
+    with conexao.cursor() as cursor:
+        try:
+            cursor.execute(
+                'CREATE VIRTUAL TABLE eventos_evento_busca USING fts5('
+                "nome, descricao, tokenize = 'unicode61 remove_diacritics 2')"
+            )
+        except OperationalError:
+            return
+        cursor.execute('INSERT INTO eventos_evento_busca (rowid, nome, descricao) '
+                       'SELECT id, nome, descricao FROM eventos_evento')
+
+
+def remover_indice_busca(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE IF EXISTS eventos_evento_busca')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventos', '0011_indices_participantes'),
+    ]
+
+    operations = [
+        migrations.RunPython(criar_indice_busca, remover_indice_busca),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 4.2 on 2026-10-18 11:12
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def remover_certificados_duplicados(apps, schema_editor):
+    # mantém o certificado mais antigo de cada (evento, participante) e recalcula os contadores
+    Evento = apps.get_model('eventos', 'Evento')
+    Certificado = apps.get_model('eventos', 'Certificado')
+    duplicados = Certificado.objects.values('evento_id', 'participante_id').annotate(
+        primeiro=models.Min('id'), quantidade=models.Count('id')).filter(quantidade__gt=1)
+
+    eventos = set()
+    for duplicado in duplicados:
+        Certificado.objects.filter(
+            evento_id=duplicado['evento_id'], participante_id=duplicado['participante_id']
+        ).exclude(id=duplicado['primeiro']).delete()
+        eventos.add(duplicado['evento_id'])
+
+    if eventos:
+        # só os certificados de quem ainda é participante, como em 0010_total_certificados
+        Participacao = Evento.participantes.through
+        participante = models.Exists(Participacao.objects.filter(
+            evento_id=models.OuterRef('evento_id'), user_id=models.OuterRef('participante_id')))
+        total = Certificado.objects.filter(participante, evento_id=models.OuterRef('pk')).order_by().values(
+            'evento_id').annotate(total=models.Count('*')).values('total')
+        Evento.objects.filter(pk__in=eventos).update(total_certificados=Coalesce(models.Subquery(total), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventos', '0012_busca_eventos'),
+    ]
+
+    operations = [
+        migrations.RunPython(remover_certificados_duplicados, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='certificado',
+            index=models.Index(fields=['participante', 'evento'], name='certificado_participante_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='certificado',
+            constraint=models.UniqueConstraint(fields=('evento', 'participante'), name='certificado_unico'),
+        ),
+    ]
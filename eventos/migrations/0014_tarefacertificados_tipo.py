@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-18 11:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventos', '0013_certificado_unico'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tarefacertificados',
+            name='tipo',
+            field=models.CharField(choices=[('geracao', 'Geração dos certificados'), ('pdf', 'PDF para impressão')], default='geracao', max_length=7),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2 on 2026-10-18 11:56
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventos', '0014_tarefacertificados_tipo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventoBusca',
+            fields=[
+                ('evento', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='busca', serialize=False, to='eventos.evento')),
+                ('nome', models.TextField()),
+                ('descricao', models.TextField()),
+            ],
+            options={
+                'db_table': 'eventos_evento_busca',
+                'managed': False,
+            },
+        ),
+    ]
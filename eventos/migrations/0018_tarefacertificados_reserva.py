@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-18 12:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventos', '0017_evento_busca'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tarefacertificados',
+            name='reserva',
+            field=models.CharField(blank=True, max_length=16),
+        ),
+    ]
@@ -0,0 +1,65 @@
+import os
+from tempfile import NamedTemporaryFile
+
+from django.conf import settings
+from django.utils.crypto import salted_hmac
+from PIL import Image, ImageOps
+
+from .cache_certificados import caminho_em_cache
+from .models import Certificado
+
+DIRETORIO_MINIATURAS = 'miniaturas'
+
+
+def _caminho_origem(origem):
+    """caminho da imagem original de um Certificado ou de um arquivo de modelo (ex.: Evento.logo)"""
+    if isinstance(origem, Certificado):
+        if origem.template:
+            return origem.template.path
+        return caminho_em_cache(origem)
+    return origem.path
+
+
+def _url_original(origem):
+    if isinstance(origem, Certificado):
+        return origem.imagem_url
+    return origem.url
+
+
+def url_miniatura(origem, largura):
+    """
+    retorna a URL de uma miniatura em WebP da imagem, gerada no primeiro acesso e guardada
+    em MEDIA_ROOT. O nome do arquivo é um HMAC da origem para não expor certificados sob
+    demanda por uma URL previsível. Se a origem não for uma imagem válida, usa a original.
+    """
+    if not origem:
+        return ''
+
+    try:
+        caminho_origem = _caminho_origem(origem)
+        nome = salted_hmac('miniaturas', f'{caminho_origem}:{largura}').hexdigest()
+        relativo = f'{DIRETORIO_MINIATURAS}/{largura}/{nome}.webp'
+        caminho = os.path.join(settings.MEDIA_ROOT, DIRETORIO_MINIATURAS, str(largura), f'{nome}.webp')
+
+        if not os.path.exists(caminho):
+            _gerar_miniatura(caminho_origem, caminho, largura)
+    except OSError:
+        return _url_original(origem)
+
+    return f'{settings.MEDIA_URL}{relativo}'
+
+
+def _gerar_miniatura(caminho_origem, caminho, largura):
+    with Image.open(caminho_origem) as img:
+        # em JPEG o draft decodifica direto em escala reduzida
+        img.draft('RGB', (largura, largura))
+        img = ImageOps.exif_transpose(img)
+        if img.mode not in ('RGB', 'RGBA'):
+            img = img.convert('RGBA')
+        img.thumbnail((largura, largura * 10), reducing_gap=2.0)
+
+        diretorio = os.path.dirname(caminho)
+        os.makedirs(diretorio, exist_ok=True)
+        with NamedTemporaryFile(dir=diretorio, suffix='.tmp', delete=False) as arquivo:
+            img.save(arquivo, format='WEBP', quality=settings.MINIATURAS_QUALIDADE)
+        os.replace(arquivo.name, caminho)
@@ -1,5 +1,6 @@
 from django.contrib.auth.models import User
 from django.db import models
+from django.urls import reverse
 
 
 class Evento(models.Model):
@@ -16,6 +17,13 @@ class Evento(models.Model):
         related_name='evento_participante',
         blank=True
     )
+    # vazio = sem limite de vagas
+    capacidade = models.PositiveIntegerField(null=True, blank=True)
+    # contadores desnormalizados, mantidos por eventos/signals.py e pelos caminhos em lote;
+    # total_certificados conta só os certificados de participantes atuais.
+    # `manage.py recalcular_contadores` os corrige se divergirem
+    total_participantes = models.PositiveIntegerField(default=0)
+    total_certificados = models.PositiveIntegerField(default=0)
 
     # paleta de cores:
     cor_principal = models.CharField(max_length=7)
@@ -25,11 +33,111 @@ class Evento(models.Model):
     def __str__(self):
         return self.nome
 
+    @property
+    def vagas_restantes(self):
+        if self.capacidade is None:
+            return None
+        return max(self.capacidade - self.total_participantes, 0)
+
+    @property
+    def certificados_pendentes(self):
+        return max(self.total_participantes - self.total_certificados, 0)
+
+    def participantes_sem_certificado(self):
+        return self.participantes.exclude(
+            id__in=Certificado.objects.filter(evento=self).values('participante_id'))
+
+
+class ListaEspera(models.Model):
+    evento = models.ForeignKey(Evento, on_delete=models.DO_NOTHING)
+    participante = models.ForeignKey(User, on_delete=models.DO_NOTHING)
+    criada_em = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['evento', 'participante'], name='lista_espera_unica'),
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.evento.nome} - {self.participante.username}'
+
+
+class EventoBusca(models.Model):
+    """
+    tabela FTS5 da busca de eventos, criada e mantida por eventos/busca.py fora do ORM
+    (só existe no SQLite); o modelo serve apenas para juntá-la aos eventos nas consultas
+    """
+    evento = models.OneToOneField(Evento, on_delete=models.DO_NOTHING, primary_key=True,
+                                  db_column='rowid', related_name='busca')
+    nome = models.TextField()
+    descricao = models.TextField()
+
+    class Meta:
+        managed = False
+        db_table = 'eventos_evento_busca'
+
 
 class Certificado(models.Model):
-    template = models.ImageField(upload_to='certificados')
+    # vazio quando o certificado é renderizado sob demanda a partir dos campos abaixo
+    template = models.ImageField(upload_to='certificados', blank=True)
     participante = models.ForeignKey(User, on_delete=models.DO_NOTHING)
     evento = models.ForeignKey(Evento, on_delete=models.DO_NOTHING)
+    nome_evento = models.CharField(max_length=200, blank=True)
+    carga_horaria = models.PositiveIntegerField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            # um certificado por participante em cada evento; o índice também atende as
+            # consultas por evento e a busca dos participantes sem certificado
+            models.UniqueConstraint(fields=['evento', 'participante'], name='certificado_unico'),
+        ]
+        indexes = [
+            # "meus certificados" e o prefetch de "meus eventos": participante = ? AND evento_id IN (...)
+            models.Index(fields=['participante', 'evento'], name='certificado_participante_idx'),
+        ]
 
     def __str__(self) -> str:
         return f'{self.participante.username} - {self.participante.email}'
+
+    @property
+    def imagem_url(self):
+        if self.template:
+            return self.template.url
+        return reverse('imagem_certificado', args=[self.id])
+
+
+class TarefaCertificados(models.Model):
+    PENDENTE = 'pendente'
+    PROCESSANDO = 'processando'
+    CONCLUIDA = 'concluida'
+    ERRO = 'erro'
+    STATUS_CHOICES = (
+        (PENDENTE, 'Pendente'),
+        (PROCESSANDO, 'Processando'),
+        (CONCLUIDA, 'Concluída'),
+        (ERRO, 'Erro'),
+    )
+    GERACAO = 'geracao'
+    PDF = 'pdf'
+    TIPO_CHOICES = (
+        (GERACAO, 'Geração dos certificados'),
+        (PDF, 'PDF para impressão'),
+    )
+
+    evento = models.ForeignKey(Evento, on_delete=models.DO_NOTHING)
+    tipo = models.CharField(max_length=7, choices=TIPO_CHOICES, default=GERACAO)
+    status = models.CharField(max_length=11, choices=STATUS_CHOICES, default=PENDENTE, db_index=True)
+    total = models.PositiveIntegerField(default=0)
+    processados = models.PositiveIntegerField(default=0)
+    erro = models.TextField(blank=True)
+    # identifica a reserva do worker atual; muda quando outro worker retoma a tarefa
+    reserva = models.CharField(max_length=16, blank=True)
+    criada_em = models.DateTimeField(auto_now_add=True)
+    atualizada_em = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f'{self.evento.nome} - {self.status}'
+
+    @property
+    def em_andamento(self):
+        return self.status in (self.PENDENTE, self.PROCESSANDO)
@@ -0,0 +1,67 @@
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .busca import indexar_evento, remover_evento
+from .contadores import certificados_dos_usuarios, recalcular_contadores
+from .inscricoes import promover_lista_espera
+from .models import Certificado, Evento
+
+
+@receiver(m2m_changed, sender=Evento.participantes.through)
+def atualizar_total_participantes(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    mantém Evento.total_participantes nas alterações feitas pelo related manager
+    (add/remove/clear) e promove a lista de espera quando uma vaga é liberada. As
+    inscrições em eventos/inscricoes.py gravam direto na tabela intermediária e atualizam
+    o contador na própria transação.
+    """
+    if action == 'post_add' and pk_set:
+        # no post_add, pk_set contém apenas as linhas realmente inseridas; quem volta ao
+        # evento traz de volta o certificado que já tinha
+        if reverse:
+            Evento.objects.filter(pk__in=pk_set).update(
+                total_participantes=F('total_participantes') + 1,
+                total_certificados=F('total_certificados') + certificados_dos_usuarios([instance.pk]))
+        else:
+            Evento.objects.filter(pk=instance.pk).update(
+                total_participantes=F('total_participantes') + len(pk_set),
+                total_certificados=F('total_certificados') + certificados_dos_usuarios(pk_set))
+    elif action == 'pre_clear' and reverse:
+        # guarda os eventos do usuário antes de as linhas serem apagadas
+        instance._eventos_antes_do_clear = list(instance.evento_participante.values_list('pk', flat=True))
+    elif action in ('post_remove', 'post_clear'):
+        # o pk_set da remoção pode conter ids que não estavam no evento, então recontamos;
+        # as vagas liberadas passam para a lista de espera, qualquer que seja o caminho da remoção
+        if reverse:
+            eventos = pk_set if action == 'post_remove' else instance.__dict__.pop('_eventos_antes_do_clear', [])
+        else:
+            eventos = [instance.pk]
+        recalcular_contadores(Evento.objects.filter(pk__in=eventos))
+        for evento in Evento.objects.filter(pk__in=eventos).only('id'):
+            promover_lista_espera(evento)
+
+
+@receiver(post_save, sender=Certificado)
+def incrementar_total_certificados(sender, instance, created, **kwargs):
+    # o certificado de quem não é participante não entra no contador
+    if created:
+        Evento.objects.filter(pk=instance.evento_id, participantes=instance.participante_id).update(
+            total_certificados=F('total_certificados') + 1)
+
+
+@receiver(post_delete, sender=Certificado)
+def decrementar_total_certificados(sender, instance, **kwargs):
+    Evento.objects.filter(pk=instance.evento_id, participantes=instance.participante_id).update(
+        total_certificados=Greatest(F('total_certificados') - 1, 0))
+
+
+@receiver(post_save, sender=Evento)
+def indexar_evento_na_busca(sender, instance, **kwargs):
+    indexar_evento(instance)
+
+
+@receiver(post_delete, sender=Evento)
+def remover_evento_da_busca(sender, instance, **kwargs):
+    remover_evento(instance.pk)
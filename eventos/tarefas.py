@@ -0,0 +1,155 @@
+from datetime import timedelta
+from secrets import token_urlsafe
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .certificados import formato_certificado, renderizar_certificados
+from .exportacao import pdf_certificados
+from .models import Certificado, Evento, TarefaCertificados
+
+
+def enfileirar_geracao(evento, tipo=TarefaCertificados.GERACAO):
+    """
+    cria uma tarefa do tipo pedido para o evento, reaproveitando uma que ainda esteja na fila.
+    Uma tarefa em processamento abandonada também é reaproveitada: o worker a retoma.
+    """
+    tarefa = TarefaCertificados.objects.filter(
+        evento=evento,
+        tipo=tipo,
+        status__in=(TarefaCertificados.PENDENTE, TarefaCertificados.PROCESSANDO)
+    ).first()
+
+    if tarefa:
+        return tarefa
+
+    return TarefaCertificados.objects.create(evento=evento, tipo=tipo)
+
+
+class TarefaRetomada(Exception):
+    """a tarefa ficou sem batimento e foi retomada por outro worker"""
+
+
+def _disponiveis():
+    """
+    tarefas pendentes e tarefas em processamento sem batimento há mais de
+    CERTIFICADOS_TAREFA_TIMEOUT segundos, cujo worker morreu no meio da geração.
+    O worker renova atualizada_em a cada lote (veja executar_tarefa).
+    """
+    limite = timezone.now() - timedelta(seconds=settings.CERTIFICADOS_TAREFA_TIMEOUT)
+    return TarefaCertificados.objects.filter(
+        Q(status=TarefaCertificados.PENDENTE) |
+        Q(status=TarefaCertificados.PROCESSANDO, atualizada_em__lt=limite)
+    )
+
+
+def reservar_proxima_tarefa():
+    """
+    marca a tarefa disponível mais antiga como em processamento e a retorna.
+    O UPDATE condicional garante que dois workers nunca peguem a mesma tarefa.
+    """
+    disponiveis = _disponiveis().order_by('id').values_list('id', flat=True)
+
+    for tarefa_id in disponiveis[:10]:
+        # a tarefa retomada recomeça a contagem; só os certificados que faltam são gerados.
+        # A nova reserva faz o worker anterior, se ainda estiver vivo, parar no próximo lote
+        reservada = _disponiveis().filter(id=tarefa_id).update(
+            status=TarefaCertificados.PROCESSANDO, processados=0, reserva=token_urlsafe(12),
+            atualizada_em=timezone.now())
+
+        if reservada:
+            return TarefaCertificados.objects.select_related('evento').get(id=tarefa_id)
+
+    return None
+
+
+def gerar_certificados(evento, ao_progredir=None):
+    """
+    gera apenas os certificados que ainda faltam no evento, gravando as linhas com
+    bulk_create em transações por lote e chamando ao_progredir(quantidade) a cada lote.
+    No modo sob demanda apenas as linhas são gravadas, sem renderizar imagens.
+    """
+    pendentes = evento.participantes_sem_certificado().values_list('id', 'username')
+    lote = []
+
+    def gravar_lote():
+        with transaction.atomic():
+            # outra geração do mesmo evento (clique duplo, tarefa retomada) pode ter gravado parte
+            # do lote: as linhas repetidas são ignoradas e só as inseridas entram no contador
+            do_lote = Certificado.objects.filter(
+                evento=evento, participante_id__in=[certificado.participante_id for certificado in lote])
+            antes = do_lote.count()
+            Certificado.objects.bulk_create(lote, ignore_conflicts=True)
+            inseridos = do_lote.count() - antes
+            # bulk_create não dispara post_save; o contador é atualizado no mesmo lote
+            Evento.objects.filter(pk=evento.pk).update(total_certificados=F('total_certificados') + inseridos)
+
+            if inseridos < len(lote):
+                # as imagens das linhas descartadas não são referenciadas por nenhum certificado
+                gravadas = set(do_lote.values_list('template', flat=True))
+                for certificado in lote:
+                    if certificado.template and certificado.template.name not in gravadas:
+                        certificado.template.delete(save=False)
+        if ao_progredir:
+            ao_progredir(len(lote))
+        lote.clear()
+
+    if settings.CERTIFICADOS_SOB_DEMANDA:
+        certificados = ((participante_id, None) for participante_id, _ in pendentes.iterator())
+    else:
+        certificados = renderizar_certificados(evento.nome, evento.carga_horaria, pendentes)
+
+    extensao, _ = formato_certificado()
+    for participante_id, imagem in certificados:
+        certificado = Certificado(
+            participante_id=participante_id,
+            evento=evento,
+            nome_evento=evento.nome,
+            carga_horaria=evento.carga_horaria
+        )
+        if imagem is not None:
+            certificado.template.save(f'{token_urlsafe(8)}.{extensao}', ContentFile(imagem), save=False)
+        lote.append(certificado)
+
+        if len(lote) >= settings.CERTIFICADOS_LOTE:
+            gravar_lote()
+
+    if lote:
+        gravar_lote()
+
+
+def executar_tarefa(tarefa):
+    """
+    executa a tarefa reservada por reservar_proxima_tarefa. Cada lote é um batimento: renova
+    atualizada_em enquanto a reserva for deste worker; se outro worker retomou a tarefa, a
+    execução para e o estado gravado por ele é mantido.
+    """
+    evento = tarefa.evento
+    reservada = TarefaCertificados.objects.filter(id=tarefa.id, reserva=tarefa.reserva)
+    if tarefa.tipo == TarefaCertificados.PDF:
+        tarefa.total = Certificado.objects.filter(evento=evento).count()
+        executar = pdf_certificados
+    else:
+        tarefa.total = evento.participantes_sem_certificado().count()
+        executar = gerar_certificados
+    reservada.update(total=tarefa.total, atualizada_em=timezone.now())
+
+    def ao_progredir(quantidade):
+        if not reservada.update(processados=F('processados') + quantidade, atualizada_em=timezone.now()):
+            raise TarefaRetomada(f'A tarefa {tarefa.id} foi retomada por outro worker.')
+
+    try:
+        executar(evento, ao_progredir)
+    except TarefaRetomada:
+        return tarefa
+    except Exception as erro:
+        tarefa.status = TarefaCertificados.ERRO
+        tarefa.erro = str(erro)
+    else:
+        tarefa.status = TarefaCertificados.CONCLUIDA
+
+    reservada.update(status=tarefa.status, erro=tarefa.erro, atualizada_em=timezone.now())
+    return tarefa
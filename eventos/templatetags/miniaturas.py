@@ -0,0 +1,17 @@
+from django import template
+
+from eventos.miniaturas import url_miniatura
+
+register = template.Library()
+
+
+@register.filter
+def miniatura(origem, largura):
+    """{{ evento.logo|miniatura:160 }}"""
+    return url_miniatura(origem, int(largura))
+
+
+@register.simple_tag
+def miniatura_srcset(origem, *larguras):
+    """{% miniatura_srcset certificado 480 960 %}"""
+    return ', '.join(f'{url_miniatura(origem, largura)} {largura}w' for largura in larguras)
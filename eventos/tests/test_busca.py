@@ -0,0 +1,82 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from eventos.busca import buscar_eventos
+from eventos.models import Evento
+
+
+class BuscaEventosTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='testuser', password='Password12345')
+        cls.python = cls.criar_evento('Semana de Python', 'Palestras e oficinas de programação')
+        cls.django = cls.criar_evento('Workshop de Django', 'Aplicações web com Python')
+        cls.design = cls.criar_evento('Encontro de Design', 'Inscrição gratuita para estudantes')
+
+    @classmethod
+    def criar_evento(cls, nome, descricao):
+        return Evento.objects.create(
+            criador=cls.user,
+            nome=nome,
+            slug=nome.lower().replace(' ', '-'),
+            descricao=descricao,
+            data_inicio='2023-01-01',
+            data_termino='2023-01-02',
+            carga_horaria=8
+        )
+
+    def buscar(self, texto):
+        return list(buscar_eventos(Evento.objects.all(), texto))
+
+    def test_search_matches_name_and_description_by_prefix(self):
+        self.assertEqual(self.buscar('djan'), [self.django])
+        self.assertEqual(set(self.buscar('pyth')), {self.python, self.django})
+        self.assertEqual(self.buscar('oficina'), [self.python])
+
+    def test_name_matches_rank_above_description_matches(self):
+        self.assertEqual(self.buscar('python'), [self.python, self.django])
+
+    def test_search_ignores_accents_and_case(self):
+        self.assertEqual(self.buscar('INSCRICAO'), [self.design])
+        self.assertEqual(self.buscar('programacao'), [self.python])
+
+    def test_all_terms_must_match(self):
+        self.assertEqual(self.buscar('workshop python'), [self.django])
+        self.assertEqual(self.buscar('workshop design'), [])
+
+    def test_fts_syntax_in_user_input_is_treated_as_text(self):
+        self.assertEqual(self.buscar('"django" OR NEAR(design'), [])
+        self.assertEqual(self.buscar('django*'), [self.django])
+
+    def test_index_follows_saves_and_deletes(self):
+        self.django.nome = 'Workshop de Flask'
+        self.django.save()
+        self.assertEqual(self.buscar('django'), [])
+        self.assertEqual(self.buscar('flask'), [self.django])
+
+        self.design.delete()
+        self.assertEqual(self.buscar('design'), [])
+
+    def test_search_can_be_combined_with_other_filters(self):
+        outro = User.objects.create_user(username='outro')
+        self.django.participantes.add(outro)
+
+        self.assertEqual(list(buscar_eventos(Evento.objects.filter(participantes=outro), 'python')), [self.django])
+
+    def test_search_uses_the_full_text_index(self):
+        eventos = buscar_eventos(Evento.objects.all(), 'python')
+
+        with connection.cursor() as cursor:
+            sql, params = eventos.query.sql_with_params()
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            plano = ' '.join(linha[-1] for linha in cursor.fetchall())
+
+        self.assertIn('VIRTUAL TABLE INDEX', plano)
+        self.assertNotIn('SCAN eventos_evento ', f'{plano} ')
+
+    def test_falls_back_to_like_without_fts(self):
+        with mock.patch('eventos.busca.busca_disponivel', return_value=False):
+            self.assertEqual(self.buscar('python'), [self.python, self.django])
+            self.assertEqual(self.buscar('shop'), [self.django])
@@ -0,0 +1,138 @@
+import os
+import tempfile
+from io import BytesIO
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+from eventos.cache_certificados import caminho_em_cache, remover_excedentes
+from eventos.certificados import (codificar_certificado, fonte, formato_certificado,
+                                  gerar_imagem_certificado, renderizar_certificado,
+                                  renderizar_certificados, template_base)
+from PIL import Image
+
+
+class RenderizacaoCertificadoTestCase(SimpleTestCase):
+    def test_template_and_fonts_are_loaded_once(self):
+        self.assertIs(template_base(), template_base())
+        self.assertIs(fonte(60), fonte(60))
+
+    def test_render_does_not_modify_cached_template(self):
+        original = template_base().tobytes()
+        img = renderizar_certificado('testuser', 'Test Event', 8)
+
+        self.assertEqual(img.size, template_base().size)
+        self.assertNotEqual(img.tobytes(), original)
+        self.assertEqual(template_base().tobytes(), original)
+
+    def test_generated_png_is_valid(self):
+        conteudo = gerar_imagem_certificado('testuser', 'Test Event', 8)
+
+        with Image.open(BytesIO(conteudo)) as img:
+            self.assertEqual(img.format, 'PNG')
+            self.assertEqual(img.size, template_base().size)
+
+
+class FormatosCertificadoTestCase(SimpleTestCase):
+    def test_each_format_is_encoded_correctly(self):
+        img = renderizar_certificado('testuser', 'Test Event', 8)
+        esperados = {'png': ('PNG', 'RGBA'), 'png8': ('PNG', 'P'), 'webp': ('WEBP', 'RGB'), 'jpeg': ('JPEG', 'RGB')}
+
+        for formato, (formato_pil, modo) in esperados.items():
+            with self.subTest(formato=formato):
+                with Image.open(BytesIO(codificar_certificado(img, formato))) as codificada:
+                    self.assertEqual(codificada.format, formato_pil)
+                    self.assertEqual(codificada.mode, modo)
+                    self.assertEqual(codificada.size, img.size)
+
+    @override_settings(CERTIFICADOS_FORMATO='webp')
+    def test_configured_format_is_used_by_default(self):
+        self.assertEqual(formato_certificado(), ('webp', 'image/webp'))
+
+        with Image.open(BytesIO(gerar_imagem_certificado('testuser', 'Test Event', 8))) as img:
+            self.assertEqual(img.format, 'WEBP')
+
+    def test_unknown_format_raises_error(self):
+        with self.assertRaises(ValueError):
+            codificar_certificado(template_base(), 'gif')
+
+
+class RenderizacaoEmLoteTestCase(SimpleTestCase):
+    participantes = [(1, 'testuser1'), (2, 'testuser2'), (3, 'testuser3')]
+
+    def test_serial_batch_returns_every_participant(self):
+        resultado = list(renderizar_certificados('Test Event', 8, self.participantes, workers=1, tamanho_lote=2))
+
+        self.assertEqual([participante_id for participante_id, _ in resultado], [1, 2, 3])
+
+    def test_process_pool_returns_same_images_as_serial(self):
+        serial = list(renderizar_certificados('Test Event', 8, self.participantes, workers=1, tamanho_lote=1))
+        paralelo = list(renderizar_certificados('Test Event', 8, self.participantes, workers=2, tamanho_lote=1))
+
+        self.assertEqual(paralelo, serial)
+
+    @override_settings(CERTIFICADOS_FORMATO='jpeg', CERTIFICADOS_QUALIDADE=5)
+    def test_process_pool_uses_encoding_options_of_the_parent_process(self):
+        serial = list(renderizar_certificados('Test Event', 8, self.participantes, workers=1, tamanho_lote=1))
+        paralelo = list(renderizar_certificados('Test Event', 8, self.participantes, workers=2, tamanho_lote=1))
+
+        self.assertEqual(paralelo, serial)
+
+
+class CacheCertificadosTestCase(SimpleTestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.cache_dir.cleanup)
+
+    def _criar_arquivo(self, nome, tamanho, mtime):
+        caminho = os.path.join(self.cache_dir.name, nome)
+        with open(caminho, 'wb') as arquivo:
+            arquivo.write(b'0' * tamanho)
+        os.utime(caminho, (mtime, mtime))
+        return caminho
+
+    def test_least_recently_used_files_are_evicted(self):
+        antigo = self._criar_arquivo('antigo.png', 100, 1000)
+        medio = self._criar_arquivo('medio.png', 100, 2000)
+        recente = self._criar_arquivo('recente.png', 100, 3000)
+
+        with override_settings(CERTIFICADOS_CACHE_DIR=self.cache_dir.name, CERTIFICADOS_CACHE_MAX_BYTES=200):
+            remover_excedentes()
+
+        self.assertFalse(os.path.exists(antigo))
+        self.assertTrue(os.path.exists(medio))
+        self.assertTrue(os.path.exists(recente))
+
+    def test_file_just_written_is_kept(self):
+        novo = self._criar_arquivo('novo.png', 300, 1000)
+
+        with override_settings(CERTIFICADOS_CACHE_DIR=self.cache_dir.name, CERTIFICADOS_CACHE_MAX_BYTES=200):
+            remover_excedentes(manter=novo)
+
+        self.assertTrue(os.path.exists(novo))
+
+    def _certificado(self, nome):
+        return SimpleNamespace(participante=SimpleNamespace(username=nome), nome_evento='Evento',
+                               carga_horaria=8, evento=None)
+
+    def test_directory_is_only_scanned_when_estimate_exceeds_limit(self):
+        with override_settings(CERTIFICADOS_CACHE_DIR=self.cache_dir.name, CERTIFICADOS_CACHE_MAX_BYTES=10 ** 9), \
+                mock.patch('eventos.cache_certificados.os.walk', wraps=os.walk) as varredura:
+            for i in range(5):
+                caminho_em_cache(self._certificado(f'participante{i}'))
+
+        # apenas a primeira gravação do processo mede o diretório
+        self.assertEqual(varredura.call_count, 1)
+
+    def test_cache_stays_below_limit_after_many_misses(self):
+        tamanho = len(gerar_imagem_certificado('participante0', 'Evento', 8))
+        limite = tamanho * 3
+
+        with override_settings(CERTIFICADOS_CACHE_DIR=self.cache_dir.name, CERTIFICADOS_CACHE_MAX_BYTES=limite):
+            for i in range(8):
+                ultimo = caminho_em_cache(self._certificado(f'participante{i}'))
+
+        tamanhos = [os.path.getsize(os.path.join(raiz, nome))
+                    for raiz, _, nomes in os.walk(self.cache_dir.name) for nome in nomes]
+        self.assertLessEqual(sum(tamanhos), limite * 1.1)
+        self.assertTrue(os.path.exists(ultimo))
@@ -0,0 +1,196 @@
+import random
+import threading
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TransactionTestCase
+from eventos.inscricoes import EM_ESPERA, INSCRITO, JA_INSCRITO, cancelar_inscricao, inscrever
+from eventos.models import Evento, ListaEspera
+
+
+class InscricaoTestCase(TransactionTestCase):
+    def _criar_evento(self, capacidade=None):
+        criador, _ = User.objects.get_or_create(username='testcriador')
+        return Evento.objects.create(
+            criador=criador,
+            nome='Test Event',
+            slug=f'test-event-{Evento.objects.count()}',
+            descricao='This is a test event',
+            data_inicio='2023-01-01',
+            data_termino='2023-01-02',
+            carga_horaria=8,
+            capacidade=capacidade,
+            cor_principal='#ffffff',
+            cor_secundaria='#000000',
+            cor_fundo='#cccccc'
+        )
+
+    def _criar_usuarios(self, quantidade):
+        User.objects.bulk_create([User(username=f'participante{i}') for i in range(quantidade)])
+        return list(User.objects.filter(username__startswith='participante').order_by('id'))
+
+    def _inscrever_em_paralelo(self, evento, usuarios, threads, repetir=True):
+        """
+        com repetir, cada thread tenta inscrever todos os usuários, em ordem diferente;
+        sem repetir, os usuários são divididos entre as threads
+        """
+        resultados = []
+        erros = []
+        barreira = threading.Barrier(threads)
+
+        def inscrever_todos(usuarios):
+            try:
+                barreira.wait()
+                for usuario in random.sample(usuarios, len(usuarios)):
+                    resultados.append(inscrever(evento, usuario))
+            except Exception as erro:
+                erros.append(erro)
+            finally:
+                connection.close()
+
+        trabalhadores = [
+            threading.Thread(target=inscrever_todos, args=(usuarios if repetir else usuarios[i::threads],))
+            for i in range(threads)
+        ]
+        for trabalhador in trabalhadores:
+            trabalhador.start()
+        for trabalhador in trabalhadores:
+            trabalhador.join()
+
+        self.assertEqual(erros, [])
+        return resultados
+
+
+class InscricaoConcorrenteTestCase(InscricaoTestCase):
+    THREADS = 8
+    USUARIOS = 100
+
+    def test_inscrever_returns_whether_user_was_enrolled(self):
+        evento = self._criar_evento()
+        usuario = self._criar_usuarios(1)[0]
+
+        self.assertEqual(inscrever(evento, usuario), INSCRITO)
+        self.assertEqual(inscrever(evento, usuario), JA_INSCRITO)
+        self.assertEqual(evento.participantes.count(), 1)
+
+    def test_concurrent_registrations_are_not_lost_or_duplicated(self):
+        evento = self._criar_evento()
+        resultados = self._inscrever_em_paralelo(evento, self._criar_usuarios(self.USUARIOS), self.THREADS)
+
+        self.assertEqual(len(resultados), self.THREADS * self.USUARIOS)
+        # cada usuário foi inscrito exatamente uma vez, apesar das tentativas simultâneas
+        self.assertEqual(resultados.count(INSCRITO), self.USUARIOS)
+        self.assertEqual(evento.participantes.count(), self.USUARIOS)
+        evento.refresh_from_db()
+        self.assertEqual(evento.total_participantes, self.USUARIOS)
+
+
+class CapacidadeTestCase(InscricaoTestCase):
+    def test_user_goes_to_waitlist_when_event_is_full(self):
+        evento = self._criar_evento(capacidade=1)
+        primeiro, segundo = self._criar_usuarios(2)
+
+        self.assertEqual(inscrever(evento, primeiro), INSCRITO)
+        self.assertEqual(inscrever(evento, segundo), EM_ESPERA)
+        self.assertEqual(inscrever(evento, segundo), EM_ESPERA)
+        self.assertEqual(inscrever(evento, primeiro), JA_INSCRITO)
+        self.assertEqual(ListaEspera.objects.filter(evento=evento).count(), 1)
+        evento.refresh_from_db()
+        self.assertEqual(evento.vagas_restantes, 0)
+
+    def test_cancellation_promotes_first_in_waitlist(self):
+        evento = self._criar_evento(capacidade=1)
+        primeiro, segundo, terceiro = self._criar_usuarios(3)
+        for usuario in (primeiro, segundo, terceiro):
+            inscrever(evento, usuario)
+
+        self.assertTrue(cancelar_inscricao(evento, primeiro))
+
+        self.assertEqual(list(evento.participantes.all()), [segundo])
+        self.assertEqual(list(ListaEspera.objects.filter(evento=evento).values_list('participante', flat=True)),
+                         [terceiro.id])
+        evento.refresh_from_db()
+        self.assertEqual(evento.total_participantes, 1)
+
+    def test_enrolment_removes_user_from_waitlist(self):
+        evento = self._criar_evento(capacidade=1)
+        primeiro, segundo = self._criar_usuarios(2)
+        inscrever(evento, primeiro)
+        inscrever(evento, segundo)
+
+        Evento.objects.filter(pk=evento.pk).update(capacidade=2)
+        self.assertEqual(inscrever(evento, segundo), INSCRITO)
+        self.assertFalse(ListaEspera.objects.filter(evento=evento).exists())
+
+        # antes, a linha antiga do segundo fazia a promoção falhar com IntegrityError
+        self.assertTrue(cancelar_inscricao(evento, primeiro))
+        self.assertEqual(list(evento.participantes.all()), [segundo])
+        evento.refresh_from_db()
+        self.assertEqual(evento.total_participantes, 1)
+
+    def test_removal_outside_cancellation_promotes_waitlist(self):
+        evento = self._criar_evento(capacidade=1)
+        primeiro, segundo, terceiro = self._criar_usuarios(3)
+        for usuario in (primeiro, segundo, terceiro):
+            inscrever(evento, usuario)
+
+        # remoção pelo admin ou pelo related manager também passa a vaga adiante
+        evento.participantes.remove(primeiro)
+        self.assertEqual(list(evento.participantes.all()), [segundo])
+        self.assertEqual(inscrever(evento, segundo), JA_INSCRITO)
+
+        # pelo lado do usuário
+        segundo.evento_participante.clear()
+        self.assertEqual(list(evento.participantes.all()), [terceiro])
+        self.assertFalse(ListaEspera.objects.filter(evento=evento).exists())
+        evento.refresh_from_db()
+        self.assertEqual(evento.total_participantes, 1)
+
+    def test_removal_promotes_as_many_as_seats_freed(self):
+        evento = self._criar_evento(capacidade=2)
+        usuarios = self._criar_usuarios(5)
+        for usuario in usuarios:
+            inscrever(evento, usuario)
+
+        evento.participantes.clear()
+
+        self.assertEqual(set(evento.participantes.all()), set(usuarios[2:4]))
+        self.assertEqual(list(ListaEspera.objects.filter(evento=evento).values_list('participante', flat=True)),
+                         [usuarios[4].id])
+        evento.refresh_from_db()
+        self.assertEqual(evento.total_participantes, 2)
+
+    def test_stale_waitlist_row_of_participant_is_skipped(self):
+        evento = self._criar_evento(capacidade=2)
+        primeiro, segundo, terceiro = self._criar_usuarios(3)
+        inscrever(evento, primeiro)
+        inscrever(evento, segundo)
+        # linha gravada antes de a inscrição passar a limpar a lista de espera, à frente do terceiro
+        ListaEspera.objects.create(evento=evento, participante=segundo)
+        inscrever(evento, terceiro)
+
+        self.assertTrue(cancelar_inscricao(evento, primeiro))
+        self.assertEqual(set(evento.participantes.all()), {segundo, terceiro})
+
+    def test_cancellation_without_waitlist_frees_seat(self):
+        evento = self._criar_evento(capacidade=1)
+        usuario = self._criar_usuarios(1)[0]
+        inscrever(evento, usuario)
+
+        self.assertTrue(cancelar_inscricao(evento, usuario))
+        self.assertFalse(cancelar_inscricao(evento, usuario))
+        evento.refresh_from_db()
+        self.assertEqual(evento.total_participantes, 0)
+
+    def test_concurrent_load_never_exceeds_capacity(self):
+        capacidade = 25
+        usuarios = self._criar_usuarios(2000)
+        evento = self._criar_evento(capacidade=capacidade)
+
+        resultados = self._inscrever_em_paralelo(evento, usuarios, threads=8, repetir=False)
+
+        self.assertEqual(resultados.count(INSCRITO), capacidade)
+        self.assertEqual(evento.participantes.count(), capacidade)
+        self.assertEqual(ListaEspera.objects.filter(evento=evento).count(), len(usuarios) - capacidade)
+        evento.refresh_from_db()
+        self.assertEqual(evento.total_participantes, capacidade)
@@ -0,0 +1,72 @@
+import os
+import tempfile
+from io import BytesIO
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from eventos.miniaturas import url_miniatura
+from eventos.models import Certificado, Evento
+from PIL import Image
+
+
+class MiniaturasTestCase(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.media_root.cleanup)
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root.name,
+                                                   CERTIFICADOS_CACHE_DIR=self.media_root.name + '/cache')
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+
+        self.user = User.objects.create_user(username='testuser')
+        output = BytesIO()
+        Image.new('RGB', (1200, 600), 'red').save(output, format='PNG')
+        self.evento = Evento.objects.create(
+            criador=self.user,
+            nome='Test Event',
+            slug='test-event',
+            descricao='This is a test event',
+            data_inicio='2023-01-01',
+            data_termino='2023-01-02',
+            carga_horaria=8,
+            logo=SimpleUploadedFile('logo.png', output.getvalue(), content_type='image/png'),
+            cor_principal='#ffffff',
+            cor_secundaria='#000000',
+            cor_fundo='#cccccc'
+        )
+
+    def _caminho(self, url):
+        return os.path.join(self.media_root.name, url.removeprefix('/media/'))
+
+    def test_thumbnail_is_generated_once(self):
+        url = url_miniatura(self.evento.logo, 160)
+
+        self.assertTrue(url.startswith('/media/miniaturas/160/'))
+        self.assertTrue(url.endswith('.webp'))
+        with Image.open(self._caminho(url)) as img:
+            self.assertEqual(img.format, 'WEBP')
+            self.assertEqual(img.size, (160, 80))
+
+        os.utime(self._caminho(url), (1000, 1000))
+        self.assertEqual(url_miniatura(self.evento.logo, 160), url)
+        self.assertEqual(os.path.getmtime(self._caminho(url)), 1000)
+
+    def test_on_demand_certificate_thumbnail(self):
+        certificado = Certificado.objects.create(participante=self.user, evento=self.evento,
+                                                 nome_evento='Test Event', carga_horaria=8)
+        url = url_miniatura(certificado, 480)
+
+        with Image.open(self._caminho(url)) as img:
+            self.assertEqual(img.width, 480)
+
+    def test_invalid_image_falls_back_to_original(self):
+        template = SimpleUploadedFile('teste.png', b'template_content', content_type='image/png')
+        certificado = Certificado.objects.create(template=template, participante=self.user, evento=self.evento)
+
+        self.assertEqual(url_miniatura(certificado, 480), certificado.template.url)
+
+    def test_empty_file_returns_empty_url(self):
+        self.evento.logo = None
+
+        self.assertEqual(url_miniatura(self.evento.logo, 160), '')
@@ -1,5 +1,10 @@
+from io import StringIO
+
 from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import IntegrityError, transaction
 from django.test import TestCase
+from eventos.inscricoes import cancelar_inscricao, inscrever
 from eventos.models import Certificado, Evento
 
 
@@ -97,16 +102,25 @@ class CertificadoTestCase(TestCase):
         )
 
     def test_create_certificado(self):
+        participante = User.objects.create(username='participante2', email='participante2@example.com')
         certificado = Certificado.objects.create(
             template='certificados/teste2.jpg',
-            participante=self.user,
+            participante=participante,
             evento=self.evento
         )
         self.assertEqual(Certificado.objects.count(), 2)
         self.assertEqual(certificado.template, 'certificados/teste2.jpg')
-        self.assertEqual(certificado.participante, self.user)
+        self.assertEqual(certificado.participante, participante)
         self.assertEqual(certificado.evento, self.evento)
 
+    def test_duplicate_certificado_is_rejected(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Certificado.objects.create(
+                template='certificados/teste2.jpg',
+                participante=self.user,
+                evento=self.evento
+            )
+
     def test_participante_validation(self):
         with self.assertRaises(Exception):
             Certificado.objects.create(
@@ -116,3 +130,83 @@ class CertificadoTestCase(TestCase):
 
     def test_object_name_is_username_and_email(self):
         self.assertEqual(str(self.certificado), 'testuser - testuser@example.com')
+
+
+class ContadoresEventoTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username='testuser')
+        cls.evento = Evento.objects.create(
+            criador=cls.user,
+            nome='Test Event',
+            slug='test-event',
+            descricao='This is a test event',
+            data_inicio='2023-01-01',
+            data_termino='2023-01-02',
+            carga_horaria=8,
+            cor_principal='#ffffff',
+            cor_secundaria='#000000',
+            cor_fundo='#cccccc'
+        )
+        cls.user1 = User.objects.create(username='testuser1')
+        cls.user2 = User.objects.create(username='testuser2')
+
+    def _totais(self):
+        self.evento.refresh_from_db()
+        return self.evento.total_participantes, self.evento.total_certificados
+
+    def test_participant_counter_follows_add_remove_and_clear(self):
+        self.evento.participantes.add(self.user1, self.user2)
+        self.evento.participantes.add(self.user1)
+        self.assertEqual(self._totais(), (2, 0))
+
+        self.evento.participantes.remove(self.user1, self.user)
+        self.assertEqual(self._totais(), (1, 0))
+
+        self.evento.participantes.clear()
+        self.assertEqual(self._totais(), (0, 0))
+
+    def test_participant_counter_follows_reverse_relation(self):
+        self.user1.evento_participante.add(self.evento)
+        self.assertEqual(self._totais(), (1, 0))
+
+        self.user1.evento_participante.clear()
+        self.assertEqual(self._totais(), (0, 0))
+
+    def test_certificate_counter(self):
+        self.evento.participantes.add(self.user1)
+        certificado = Certificado.objects.create(template='certificados/teste.jpg', participante=self.user1,
+                                                 evento=self.evento)
+        self.assertEqual(self._totais(), (1, 1))
+
+        certificado.delete()
+        self.assertEqual(self._totais(), (1, 0))
+
+    def test_certificate_counter_only_counts_current_participants(self):
+        self.evento.participantes.add(self.user1)
+        Certificado.objects.create(template='certificados/teste.jpg', participante=self.user1, evento=self.evento)
+        Certificado.objects.create(template='certificados/teste.jpg', participante=self.user2, evento=self.evento)
+        self.assertEqual(self._totais(), (1, 1))
+
+        # o participante certificado cancela e outro entra: o pendente é o novo participante
+        cancelar_inscricao(self.evento, self.user1)
+        inscrever(self.evento, self.user)
+        self.assertEqual(self._totais(), (1, 0))
+        self.assertEqual(self.evento.certificados_pendentes, self.evento.participantes_sem_certificado().count())
+
+        # quem volta ao evento traz o certificado de volta
+        inscrever(self.evento, self.user1)
+        self.evento.participantes.add(self.user2)
+        self.assertEqual(self._totais(), (3, 2))
+
+        self.evento.participantes.remove(self.user2)
+        self.assertEqual(self._totais(), (2, 1))
+
+    def test_recalcular_contadores_fixes_drift(self):
+        self.evento.participantes.add(self.user1, self.user2)
+        Certificado.objects.create(template='certificados/teste.jpg', participante=self.user1, evento=self.evento)
+        Evento.objects.filter(pk=self.evento.pk).update(total_participantes=99, total_certificados=99)
+
+        call_command('recalcular_contadores', stdout=StringIO())
+
+        self.assertEqual(self._totais(), (2, 1))
@@ -0,0 +1,103 @@
+import re
+import tempfile
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from eventos.models import Certificado, Evento, TarefaCertificados
+
+# "SCAN tabela" sem índice; "SCAN tabela USING INDEX", tabelas virtuais (FTS5) e
+# "SCAN CONSTANT ROW" não são varreduras completas da tabela
+VARREDURA_COMPLETA = re.compile(r'^SCAN (?!CONSTANT ROW)\S+(?: AS \S+)?$')
+
+
+class PlanosDeConsultaTestCase(TestCase):
+    """
+    executa as views com as consultas capturadas e roda EXPLAIN QUERY PLAN em cada uma;
+    o teste falha se alguma percorrer uma tabela inteira em vez de usar um índice
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.criador = User.objects.create_user(username='criador', email='criador@example.com',
+                                               password='Password12345')
+        cls.participante = User.objects.create_user(username='participante', email='participante@example.com',
+                                                    password='Password12345')
+        cls.evento = Evento.objects.create(
+            criador=cls.criador,
+            nome='Semana de Python',
+            slug='semana-de-python',
+            descricao='Palestras e oficinas',
+            data_inicio='2023-01-01',
+            data_termino='2023-01-02',
+            carga_horaria=8,
+            logo='logos/semana.png',
+            capacidade=100
+        )
+        cls.evento.participantes.add(cls.participante, User.objects.create_user(username='outro'))
+        cls.certificado = Certificado.objects.create(participante=cls.participante, evento=cls.evento,
+                                                     nome_evento=cls.evento.nome, carga_horaria=8)
+        TarefaCertificados.objects.create(evento=cls.evento)
+
+    def setUp(self):
+        # o certificado é sob demanda; o ZIP e a imagem o renderizam no cache, e as listagens
+        # gravam as miniaturas em MEDIA_ROOT
+        self.media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.media_root.cleanup)
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root.name,
+                                                   CERTIFICADOS_CACHE_DIR=self.media_root.name + '/cache')
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+
+    def assertSemVarreduraCompleta(self, url, metodo='get', dados=None):
+        with CaptureQueriesContext(connection) as consultas:
+            response = getattr(self.client, metodo)(url, dados or {})
+            if response.streaming:
+                b''.join(response.streaming_content)
+
+        self.assertLess(response.status_code, 400)
+
+        with connection.cursor() as cursor:
+            for consulta in consultas:
+                sql = consulta['sql']
+                if not sql.lstrip().upper().startswith(('SELECT', 'UPDATE', 'DELETE')):
+                    continue
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+                varreduras = [linha[-1] for linha in cursor.fetchall() if VARREDURA_COMPLETA.match(linha[-1])]
+                if varreduras:
+                    self.fail(f'{url}: {", ".join(varreduras)} em\n{sql}')
+
+        return response
+
+    def test_organizer_views_use_indexes(self):
+        self.client.login(username='criador', password='Password12345')
+        slug = self.evento.slug
+
+        self.assertSemVarreduraCompleta(reverse('gerenciar_eventos'))
+        self.assertSemVarreduraCompleta(reverse('gerenciar_eventos'), dados={'titulo': 'python'})
+        self.assertSemVarreduraCompleta(reverse('participantes_evento', args=[slug]))
+        self.assertSemVarreduraCompleta(reverse('participantes_evento', args=[slug]), dados={'busca': 'part'})
+        self.assertSemVarreduraCompleta(reverse('exportar_csv', args=[slug]))
+        self.assertSemVarreduraCompleta(reverse('certificados_evento', args=[slug]))
+        self.assertSemVarreduraCompleta(reverse('progresso_certificados', args=[slug]))
+        self.assertSemVarreduraCompleta(reverse('procurar_certificado', args=[slug]), 'post',
+                                        {'email': 'participante@example.com'})
+        self.assertSemVarreduraCompleta(reverse('baixar_certificados', args=[slug]))
+
+    def test_participant_views_use_indexes(self):
+        self.client.login(username='participante', password='Password12345')
+
+        self.assertSemVarreduraCompleta(reverse('meus_eventos'))
+        self.assertSemVarreduraCompleta(reverse('meus_eventos'), dados={'titulo': 'python'})
+        self.assertSemVarreduraCompleta(reverse('meus_certificados'))
+        self.assertSemVarreduraCompleta(reverse('inscricao', args=[self.evento.slug]))
+        self.assertSemVarreduraCompleta(reverse('cancelar_inscricao', args=[self.evento.slug]), 'post')
+        self.assertSemVarreduraCompleta(reverse('inscricao', args=[self.evento.slug]), 'post')
+
+        self.assertSemVarreduraCompleta(reverse('imagem_certificado', args=[self.certificado.id]))
+
+    def test_login_by_email_uses_indexes(self):
+        self.assertSemVarreduraCompleta(reverse('login'), 'post',
+                                        {'username': 'participante@example.com', 'senha': 'Password12345'})
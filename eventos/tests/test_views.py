@@ -1,8 +1,39 @@
+import gzip
+import json
+import os
+import tempfile
+import unittest
+import zipfile
+from datetime import timedelta
+from io import BytesIO, StringIO
+from unittest import mock
+
 from django.contrib.auth.models import User
 from django.core.files.uploadedfile import SimpleUploadedFile
-from django.test import TestCase
+from django.core.management import call_command
+from django.db import OperationalError, connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
-from eventos.models import Certificado, Evento
+from django.utils import timezone
+from eventos import importacao
+from eventos.certificados import gerar_imagem_certificado
+from eventos.exportacao import pdf_certificados
+from eventos.inscricoes import INSCRITO, cancelar_inscricao, inscrever
+from eventos.models import Certificado, Evento, ListaEspera, TarefaCertificados
+from eventos.tarefas import executar_tarefa, gerar_certificados, reservar_proxima_tarefa
+from PIL import Image
+from PIL.PdfParser import PdfParser
+
+
+def setUpModule():
+    # logos e certificados criados pelos testes, inclusive em setUpTestData, vão para um
+    # MEDIA_ROOT temporário
+    media_root = tempfile.TemporaryDirectory()
+    unittest.addModuleCleanup(media_root.cleanup)
+    settings_override = override_settings(MEDIA_ROOT=media_root.name)
+    settings_override.enable()
+    unittest.addModuleCleanup(settings_override.disable)
 
 
 class NovoEventoViewTestCase(TestCase):
@@ -42,6 +73,48 @@ class NovoEventoViewTestCase(TestCase):
         self.assertEqual(len(messages), 1)
         self.assertEqual(str(messages[0]), 'Evento cadastrado com sucesso!')
 
+    def test_novo_evento_view_rejects_invalid_capacity(self):
+        self.client.login(username='testuser', password='Password12345')
+
+        for capacidade in ('0', '-3', 'abc', '1.5'):
+            logo = SimpleUploadedFile("file.png", b"file_content", content_type="image/png")
+            response = self.client.post(self.url, {
+                'nome': 'Teste',
+                'descricao': 'Teste de evento',
+                'data_inicio': '2023-05-01',
+                'data_termino': '2023-05-02',
+                'carga_horaria': 8,
+                'capacidade': capacidade,
+                'logo': logo,
+                'cor_principal': '#000000',
+                'cor_secundaria': '#FFFFFF',
+                'cor_fundo': '#CCCCCC'
+            })
+
+            self.assertRedirects(response, self.url)
+            messages = list(response.wsgi_request._messages)
+            self.assertEqual(str(messages[0]), 'A capacidade deve ser um número inteiro maior que zero.')
+
+        self.assertFalse(Evento.objects.exists())
+
+    def test_novo_evento_view_with_capacity(self):
+        self.client.login(username='testuser', password='Password12345')
+        logo = SimpleUploadedFile("file.png", b"file_content", content_type="image/png")
+        self.client.post(self.url, {
+            'nome': 'Teste',
+            'descricao': 'Teste de evento',
+            'data_inicio': '2023-05-01',
+            'data_termino': '2023-05-02',
+            'carga_horaria': 8,
+            'capacidade': ' 30 ',
+            'logo': logo,
+            'cor_principal': '#000000',
+            'cor_secundaria': '#FFFFFF',
+            'cor_fundo': '#CCCCCC'
+        })
+
+        self.assertEqual(Evento.objects.get().capacidade, 30)
+
     def test_novo_evento_view_with_incomplete_data(self):
         self.client.login(username='testuser', password='Password12345')
         response = self.client.post(self.url, {
@@ -114,6 +187,79 @@ class GerenciarEventosViewTestCase(TestCase):
         self.assertEqual(response.status_code, 302)
         self.assertRedirects(response, '/usuarios/login/?next=/eventos/gerenciar_eventos/')
 
+    def test_dashboard_shows_participant_and_certificate_totals(self):
+        evento = Evento.objects.get(slug='test-event1')
+        participantes = [User.objects.create_user(username=f'participante{i}') for i in range(3)]
+        evento.participantes.add(*participantes)
+        Certificado.objects.create(evento=evento, participante=participantes[0])
+        self.client.login(username='testuser', password='Password12345')
+
+        response = self.client.get(self.url)
+
+        evento = next(e for e in response.context['eventos'] if e.slug == 'test-event1')
+        self.assertEqual(evento.total_participantes, 3)
+        self.assertEqual(evento.total_certificados, 1)
+        self.assertEqual(evento.certificados_pendentes, 2)
+        self.assertContains(response, '<td>3</td>')
+
+    def test_dashboard_is_paginated_with_cursors(self):
+        for i in range(4, 46):
+            Evento.objects.create(criador=self.user, nome=f'Test Event{i}', slug=f'test-event{i}',
+                                  descricao='d', data_inicio='2023-01-01', data_termino='2023-01-02',
+                                  carga_horaria=8)
+        self.client.login(username='testuser', password='Password12345')
+
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.context['eventos']), 20)
+        self.assertIsNone(response.context['cursor_anterior'])
+
+        response = self.client.get(self.url, {'apos': response.context['cursor_proxima']})
+        response = self.client.get(self.url, {'apos': response.context['cursor_proxima']})
+        self.assertEqual([e.slug for e in response.context['eventos']],
+                         [f'test-event{i}' for i in range(41, 46)])
+        self.assertIsNone(response.context['cursor_proxima'])
+
+    def test_search_results_are_paginated(self):
+        for i in range(4, 46):
+            Evento.objects.create(criador=self.user, nome=f'Workshop {i}', slug=f'workshop-{i}',
+                                  descricao='d', data_inicio='2023-01-01', data_termino='2023-01-02',
+                                  carga_horaria=8)
+        self.client.login(username='testuser', password='Password12345')
+
+        vistos = []
+        response = self.client.get(self.url, {'titulo': 'workshop'})
+        self.assertIsNone(response.context['pagina_anterior'])
+        while True:
+            vistos += [e.slug for e in response.context['eventos']]
+            if not response.context['pagina_proxima']:
+                break
+            self.assertContains(response, f'pagina={response.context["pagina_proxima"]}')
+            response = self.client.get(self.url, {'titulo': 'workshop', 'pagina': response.context['pagina_proxima']})
+
+        self.assertEqual(response.context['pagina_anterior'], 2)
+        self.assertEqual(sorted(vistos), sorted(f'workshop-{i}' for i in range(4, 46)))
+
+        with mock.patch('eventos.views.PAGINAS_BUSCA', 2):
+            response = self.client.get(self.url, {'titulo': 'workshop', 'pagina': 9})
+        self.assertEqual(len(response.context['eventos']), 20)
+        self.assertIsNone(response.context['pagina_proxima'])
+
+    def test_dashboard_query_count_does_not_depend_on_number_of_events(self):
+        self.client.login(username='testuser', password='Password12345')
+        self.client.get(self.url)
+
+        with CaptureQueriesContext(connection) as poucos:
+            self.client.get(self.url)
+
+        for i in range(4, 30):
+            evento = Evento.objects.create(criador=self.user, nome=f'Test Event{i}', slug=f'test-event{i}',
+                                           descricao='d', data_inicio='2023-01-01', data_termino='2023-01-02',
+                                           carga_horaria=8)
+            evento.participantes.add(self.user)
+
+        with self.assertNumQueries(len(poucos)):
+            self.client.get(self.url)
+
 
 class InscricaoViewTestCase(TestCase):
     @classmethod
@@ -142,6 +288,27 @@ class InscricaoViewTestCase(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, 'inscricao_evento.html')
 
+    def test_page_query_count_does_not_depend_on_participants(self):
+        self.client.login(username='testuser', password='Password12345')
+        # aquece a sessão para que o login não entre na contagem
+        self.client.get(self.url)
+
+        with CaptureQueriesContext(connection) as sem_participantes:
+            response = self.client.get(self.url)
+        self.assertFalse(response.context['inscrito'])
+
+        self.evento.participantes.add(*[
+            User.objects.create(username=f'participante{i}') for i in range(50)
+        ])
+        with self.assertNumQueries(len(sem_participantes)):
+            response = self.client.get(self.url)
+        self.assertFalse(response.context['inscrito'])
+
+        self.evento.participantes.add(self.user)
+        response = self.client.get(self.url)
+        self.assertTrue(response.context['inscrito'])
+        self.assertContains(response, 'VOCÊ JÁ ESTÁ PARTICIPANDO DESTE EVENTO')
+
     def test_if_the_user_can_subscribe_in_the_event(self):
         self.client.login(username='testuser', password='Password12345')
         response = self.client.post(self.url)
@@ -160,6 +327,25 @@ class InscricaoViewTestCase(TestCase):
         self.assertEqual(len(messages), 1)
         self.assertEqual(str(messages[0]), 'Você já se inscreveu neste evento.')
 
+    def test_user_goes_to_waitlist_if_event_is_full(self):
+        Evento.objects.filter(pk=self.evento.pk).update(capacidade=0)
+        self.client.login(username='testuser', password='Password12345')
+        response = self.client.post(self.url)
+        messages = list(response.wsgi_request._messages)
+
+        self.assertEqual(str(messages[0]), 'Evento lotado. Você está na lista de espera.')
+        self.assertTrue(self.client.get(self.url).context['em_espera'])
+
+    def test_user_can_cancel_registration(self):
+        self.client.login(username='testuser', password='Password12345')
+        self.client.post(self.url)
+        response = self.client.post(reverse('cancelar_inscricao', args=[self.evento.slug]))
+        messages = list(response.wsgi_request._messages)
+
+        self.assertRedirects(response, self.url)
+        self.assertEqual(str(messages[-1]), 'Inscrição cancelada.')
+        self.assertNotIn(self.user, self.evento.participantes.all())
+
     def test_if_user_is_redirected_to_login_page_if_they_are_not_logged_in(self):
         response = self.client.post(self.url)
 
@@ -212,6 +398,64 @@ class ParticipantesEventoViewTestCase(TestCase):
         self.assertEqual(response.status_code, 302)
         self.assertRedirects(response, '/usuarios/login/?next=/eventos/participantes_evento/test-slug/')
 
+    def test_participants_are_paginated_with_cursors(self):
+        usuarios = User.objects.bulk_create(
+            User(username=f'participante{i:03}', email=f'participante{i:03}@example.com') for i in range(120))
+        self.evento.participantes.add(*usuarios)
+        self.client.login(username='testuser', password='Password12345')
+
+        response = self.client.get(self.url)
+        primeira = response.context['participantes']
+        self.assertEqual(len(primeira), 50)
+        self.assertEqual(primeira[0].username, 'participante000')
+        self.assertIsNone(response.context['cursor_anterior'])
+
+        response = self.client.get(self.url, {'apos': response.context['cursor_proxima']})
+        segunda = response.context['participantes']
+        self.assertEqual(segunda[0].username, 'participante050')
+
+        response = self.client.get(self.url, {'apos': response.context['cursor_proxima']})
+        self.assertEqual(len(response.context['participantes']), 20)
+        self.assertIsNone(response.context['cursor_proxima'])
+
+        response = self.client.get(self.url, {'antes': response.context['cursor_anterior']})
+        self.assertEqual(response.context['participantes'], segunda)
+
+    def test_page_query_count_does_not_depend_on_position(self):
+        usuarios = User.objects.bulk_create(User(username=f'participante{i:03}') for i in range(120))
+        self.evento.participantes.add(*usuarios)
+        self.client.login(username='testuser', password='Password12345')
+        cursor = self.client.get(self.url).context['cursor_proxima']
+
+        with self.assertNumQueries(4):
+            self.client.get(self.url)
+        with self.assertNumQueries(4):
+            self.client.get(self.url, {'apos': cursor})
+
+    def test_search_filters_by_username_or_email_prefix(self):
+        self.evento.participantes.add(
+            User.objects.create_user(username='maria', email='maria@example.com'),
+            User.objects.create_user(username='mariana', email='ana@example.com'),
+            User.objects.create_user(username='joao', email='marcos@example.com'),
+            User.objects.create_user(username='pedro', email='pedro@example.com'),
+        )
+        self.client.login(username='testuser', password='Password12345')
+
+        response = self.client.get(self.url, {'busca': 'mar'})
+        self.assertEqual([p.username for p in response.context['participantes']], ['maria', 'mariana', 'joao'])
+
+        response = self.client.get(self.url, {'busca': 'ana@'})
+        self.assertEqual([p.username for p in response.context['participantes']], ['mariana'])
+
+    def test_email_search_ignores_case_of_stored_address(self):
+        # normalize_email só converte o domínio para minúsculas
+        self.evento.participantes.add(User.objects.create_user(username='participante', email='Joao.Silva@Example.com'))
+        self.client.login(username='testuser', password='Password12345')
+
+        for busca in ('Joao', 'joao.s', 'JOAO.SILVA@EXAMPLE'):
+            response = self.client.get(self.url, {'busca': busca})
+            self.assertEqual([p.username for p in response.context['participantes']], ['participante'])
+
 
 class ExportarCSVViewTestCase(TestCase):
     @classmethod
@@ -233,14 +477,83 @@ class ExportarCSVViewTestCase(TestCase):
         )
         cls.url = reverse('exportar_csv', args=[cls.evento.slug])
 
-    def test_if_view_generates_csv(self):
+    def test_if_view_streams_csv(self):
+        self.evento.participantes.add(
+            User.objects.create_user(username='participante1', email='participante1@example.com'),
+            User.objects.create_user(username='participante2', email='participante2@example.com'),
+        )
         self.client.login(username='testuser', password='Password12345')
         response = self.client.get(self.url)
-        self.assertEqual(response.status_code, 302)
 
-        token = response.url.split('/')[-1]
-        file = SimpleUploadedFile(name=token, content=b"username, email", content_type="text/csv")
-        self.assertEqual(file.name, token)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertIn('participantes-test-slug.csv', response['Content-Disposition'])
+        self.assertEqual(
+            b''.join(response.streaming_content).decode(),
+            'participante1,participante1@example.com\r\nparticipante2,participante2@example.com\r\n'
+        )
+
+    def test_csv_is_gzipped_when_client_accepts_it(self):
+        self.evento.participantes.add(User.objects.create_user(username='participante1', email='p1@example.com'))
+        self.client.login(username='testuser', password='Password12345')
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), b'participante1,p1@example.com\r\n')
+
+    def test_csv_is_not_gzipped_when_client_refuses_it(self):
+        self.evento.participantes.add(User.objects.create_user(username='participante1', email='p1@example.com'))
+        self.client.login(username='testuser', password='Password12345')
+
+        for accept_encoding in ('gzip;q=0', 'br, gzip; q=0.0', '*;q=0', 'identity', 'x-gzip-like'):
+            with self.subTest(accept_encoding=accept_encoding):
+                response = self.client.get(self.url, HTTP_ACCEPT_ENCODING=accept_encoding)
+
+                self.assertFalse(response.has_header('Content-Encoding'))
+                self.assertEqual(b''.join(response.streaming_content), b'participante1,p1@example.com\r\n')
+
+        for accept_encoding in ('deflate, GZIP;q=0.5', '*', 'br;q=1, *;q=0.1'):
+            with self.subTest(accept_encoding=accept_encoding):
+                response = self.client.get(self.url, HTTP_ACCEPT_ENCODING=accept_encoding)
+
+                self.assertEqual(response['Content-Encoding'], 'gzip')
+
+    def test_jsonl_export_with_selected_columns(self):
+        self.evento.participantes.add(User.objects.create_user(
+            username='participante1', email='p1@example.com', first_name='Participante'))
+        self.client.login(username='testuser', password='Password12345')
+        response = self.client.get(self.url, {'formato': 'jsonl', 'colunas': 'username,first_name'})
+
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertIn('participantes-test-slug.jsonl', response['Content-Disposition'])
+        linhas = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(linha) for linha in linhas], [{'username': 'participante1', 'first_name': 'Participante'}])
+
+    def test_gzipped_tsv_file_with_header(self):
+        self.evento.participantes.add(User.objects.create_user(username='participante1', email='p1@example.com'))
+        self.client.login(username='testuser', password='Password12345')
+        response = self.client.get(self.url, {'formato': 'tsv', 'colunas': ['username', 'email'],
+                                              'cabecalho': '1', 'gzip': '1'})
+
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        self.assertIn('participantes-test-slug.tsv.gz', response['Content-Disposition'])
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)),
+                         b'username\temail\r\nparticipante1\tp1@example.com\r\n')
+
+    def test_column_outside_whitelist_is_rejected(self):
+        self.client.login(username='testuser', password='Password12345')
+        response = self.client.get(self.url, {'colunas': 'password'})
+
+        self.assertRedirects(response, reverse('participantes_evento', args=[self.evento.slug]))
+        messages = list(response.wsgi_request._messages)
+        self.assertEqual(str(messages[0]), 'Formato ou colunas de exportação inválidos.')
+
+    def test_csv_is_not_written_to_media_root(self):
+        self.client.login(username='testuser', password='Password12345')
+        with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root):
+            b''.join(self.client.get(self.url).streaming_content)
+            self.assertEqual(os.listdir(media_root), [])
 
     def test_status_code_404_if_user_is_not_event_creator(self):
         self.other_user = User.objects.create_user(username='otheruser', password='Otherpass123')
@@ -256,6 +569,181 @@ class ExportarCSVViewTestCase(TestCase):
         self.assertRedirects(response, '/usuarios/login/?next=/eventos/exportar_csv/test-slug/')
 
 
+class ImportarParticipantesViewTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='testuser', password='Password12345')
+        logo = SimpleUploadedFile("file.png", b"file_content", content_type="image/png")
+        cls.evento = Evento.objects.create(
+            criador=cls.user,
+            nome=f'Test Event',
+            slug=f'test-slug',
+            descricao=f'This is a test event',
+            data_inicio='2023-01-01',
+            data_termino='2023-01-02',
+            carga_horaria=8,
+            logo=logo,
+            cor_principal='#ffffff',
+            cor_secundaria='#000000',
+            cor_fundo='#cccccc'
+        )
+        cls.url = reverse('importar_participantes', args=[cls.evento.slug])
+
+    def enviar(self, conteudo):
+        self.client.login(username='testuser', password='Password12345')
+        arquivo = SimpleUploadedFile('participantes.csv', conteudo.encode(), content_type='text/csv')
+        return self.client.post(self.url, {'arquivo': arquivo})
+
+    def test_import_creates_missing_users_and_reports_skipped_rows(self):
+        existente = User.objects.create_user(username='existente', email='Existente@example.com')
+        inscrito = User.objects.create_user(username='inscrito', email='inscrito@example.com')
+        self.evento.participantes.add(inscrito)
+
+        response = self.enviar(
+            'email,username,first_name\n'
+            'existente@example.com,,\n'
+            'novo@example.com,novo,Novo\n'
+            'sem-arroba,invalido,\n'
+            'NOVO@example.com,repetido,\n'
+            'inscrito@example.com,,\n'
+            'outro@example.com,existente,\n'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        relatorio = response.context['relatorio']
+        self.assertEqual(relatorio.inscritos, 3)
+        self.assertEqual(relatorio.usuarios_criados, 2)
+        self.assertEqual(relatorio.ignoradas, [
+            (4, 'sem-arroba', 'e-mail inválido'),
+            (5, 'novo@example.com', 'e-mail repetido no arquivo'),
+            (6, 'inscrito@example.com', 'já inscrito'),
+        ])
+
+        novo = User.objects.get(username='novo')
+        self.assertEqual(novo.first_name, 'Novo')
+        self.assertFalse(novo.has_usable_password())
+        # o username do arquivo já existia; o e-mail é usado no lugar
+        self.assertTrue(User.objects.filter(username='outro@example.com').exists())
+        self.assertEqual(set(self.evento.participantes.values_list('username', flat=True)),
+                         {'existente', 'inscrito', 'novo', 'outro@example.com'})
+        self.assertIn(existente, self.evento.participantes.all())
+
+        self.evento.refresh_from_db()
+        self.assertEqual(self.evento.total_participantes, 4)
+
+    def test_import_accepts_export_format_without_header(self):
+        self.enviar('ana,ana@example.com\r\nbia,bia@example.com\r\n')
+
+        self.assertEqual(list(self.evento.participantes.order_by('id').values_list('username', 'email')),
+                         [('ana', 'ana@example.com'), ('bia', 'bia@example.com')])
+
+    def test_import_respects_capacity(self):
+        Evento.objects.filter(pk=self.evento.pk).update(capacidade=2)
+
+        response = self.enviar('email\na@example.com\nb@example.com\nc@example.com\n')
+
+        self.assertEqual(response.context['relatorio'].ignoradas, [(4, 'c@example.com', 'evento lotado')])
+        self.assertEqual(self.evento.participantes.count(), 2)
+
+    @override_settings(IMPORTACAO_LOTE=500)
+    def test_import_runs_a_bounded_number_of_queries_per_batch(self):
+        linhas = ''.join(f'participante{i},participante{i}@example.com\n' for i in range(2000))
+
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.enviar(linhas)
+
+        self.assertEqual(response.context['relatorio'].inscritos, 2000)
+        self.assertEqual(self.evento.participantes.count(), 2000)
+        # consultas por lote (os INSERTs em lote são divididos pelo limite de parâmetros do SQLite),
+        # nunca uma por linha
+        self.assertLess(len(consultas), 100)
+
+    @override_settings(IMPORTACAO_LOTE=2)
+    def test_registrations_during_import_see_seats_taken_by_previous_batches(self):
+        Evento.objects.filter(pk=self.evento.pk).update(capacidade=3)
+        concorrente = User.objects.create_user(username='concorrente')
+        importar_lote = importacao._importar_lote
+        resultados = []
+
+        def importar_e_inscrever(*args):
+            importar_lote(*args)
+            resultados.append(inscrever(self.evento, concorrente))
+
+        with mock.patch('eventos.importacao._importar_lote', side_effect=importar_e_inscrever):
+            response = self.enviar('email\na@example.com\nb@example.com\nc@example.com\nd@example.com\n')
+
+        self.assertEqual(resultados[0], INSCRITO)
+        self.assertEqual(response.context['relatorio'].inscritos, 2)
+        self.assertEqual(self.evento.participantes.count(), 3)
+        self.evento.refresh_from_db()
+        self.assertEqual(self.evento.total_participantes, 3)
+
+    def test_rows_dropped_by_conflict_are_not_reported_as_registered(self):
+        outro = User.objects.create_user(username='outro', email='outro@example.com')
+        reservar_vagas = importacao.reservar_vagas
+
+        def inscrever_antes(evento, quantidade):
+            # inscrição feita por outra requisição depois da consulta de quem já estava inscrito
+            Evento.participantes.through.objects.create(evento_id=evento.id, user_id=outro.id)
+            return reservar_vagas(evento, quantidade)
+
+        with mock.patch('eventos.importacao.reservar_vagas', side_effect=inscrever_antes):
+            response = self.enviar('email\nnovo@example.com\noutro@example.com\n')
+
+        self.assertEqual(response.context['relatorio'].inscritos, 1)
+        self.assertEqual(self.evento.participantes.count(), 2)
+
+    def test_users_created_during_import_are_not_duplicated(self):
+        criar_usuarios = User.objects.bulk_create
+
+        def cadastrar_antes(novos, **kwargs):
+            # cadastros feitos por outra requisição depois da consulta dos usuários existentes
+            User.objects.create_user(username='cadastrado', email='Novo@example.com')
+            User.objects.create_user(username='ocupado', email='ocupado@example.com')
+            return criar_usuarios(novos, **kwargs)
+
+        with mock.patch.object(User.objects, 'bulk_create', side_effect=cadastrar_antes):
+            response = self.enviar('email,username\nnovo@example.com,novo\noutro@example.com,ocupado\n'
+                                   'terceiro@example.com,terceiro\n')
+
+        self.assertEqual(response.status_code, 200)
+        relatorio = response.context['relatorio']
+        self.assertEqual(relatorio.usuarios_criados, 1)
+        self.assertEqual(relatorio.inscritos, 2)
+        self.assertEqual(relatorio.ignoradas, [(3, 'outro@example.com', 'nome de usuário indisponível')])
+        self.assertEqual(set(self.evento.participantes.values_list('username', flat=True)), {'cadastrado', 'terceiro'})
+
+    def test_imported_users_leave_the_waitlist(self):
+        Evento.objects.filter(pk=self.evento.pk).update(capacidade=1)
+        self.evento.refresh_from_db()
+        primeiro = User.objects.create_user(username='primeiro', email='primeiro@example.com')
+        segundo = User.objects.create_user(username='segundo', email='segundo@example.com')
+        terceiro = User.objects.create_user(username='terceiro', email='terceiro@example.com')
+        for usuario in (primeiro, segundo, terceiro):
+            inscrever(self.evento, usuario)
+
+        Evento.objects.filter(pk=self.evento.pk).update(capacidade=2)
+        self.enviar('email\nsegundo@example.com\n')
+        self.assertEqual(list(ListaEspera.objects.filter(evento=self.evento).values_list('participante', flat=True)),
+                         [terceiro.id])
+
+        self.assertTrue(cancelar_inscricao(self.evento, primeiro))
+        self.assertEqual(set(self.evento.participantes.all()), {segundo, terceiro})
+
+    def test_status_code_404_if_user_is_not_event_creator(self):
+        User.objects.create_user(username='otheruser', password='Otherpass123')
+        self.client.login(username='otheruser', password='Otherpass123')
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_redirect_if_no_file_is_sent(self):
+        self.client.login(username='testuser', password='Password12345')
+        response = self.client.post(self.url)
+
+        self.assertRedirects(response, self.url)
+
+
 class CertificadosEventoViewTestCase(TestCase):
     @classmethod
     def setUpTestData(cls):
@@ -282,8 +770,21 @@ class CertificadosEventoViewTestCase(TestCase):
 
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.context['evento'], self.evento)
+        self.assertEqual(response.context['quantidade_certificados'], 0)
         self.assertTemplateUsed(response, 'certificados_evento.html')
 
+    def test_pending_count_ignores_participants_with_certificate(self):
+        participante = User.objects.create_user(username='participante')
+        outro = User.objects.create_user(username='outro')
+        self.evento.participantes.add(participante, outro)
+        template = SimpleUploadedFile("teste.png", b"template_content", content_type="image/png")
+        Certificado.objects.create(template=template, participante=participante, evento=self.evento)
+
+        self.client.login(username='testuser', password='Password12345')
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.context['quantidade_certificados'], 1)
+
     def test_status_code_404_if_user_is_not_event_creator(self):
         self.other_user = User.objects.create_user(username='otheruser', password='Otherpass123')
         self.client.login(username='otheruser', password='Otherpass123')
@@ -335,12 +836,219 @@ class GerarCertificadoViewTestCase(TestCase):
 
         messages = list(response.wsgi_request._messages)
         self.assertEqual(len(messages), 1)
-        self.assertEqual(str(messages[0]), 'Certificados gerados com sucesso')
+        self.assertEqual(str(messages[0]), 'A geração dos certificados foi iniciada.')
+
+        # a view apenas enfileira a tarefa; o worker gera os certificados
+        self.assertFalse(Certificado.objects.filter(evento=self.evento).exists())
+        call_command('processar_certificados', once=True, stdout=StringIO())
+
+        tarefa = TarefaCertificados.objects.get(evento=self.evento)
+        self.assertEqual(tarefa.status, TarefaCertificados.CONCLUIDA)
+        self.assertEqual(tarefa.processados, 2)
+        self.evento.refresh_from_db()
+        self.assertEqual(self.evento.total_certificados, 2)
 
         # Verifique se os certificados foram criados para todos os participantes do evento
         for participante in self.evento.participantes.all():
             self.assertTrue(Certificado.objects.filter(participante=participante, evento=self.evento).exists())
 
+    def test_generation_only_renders_missing_certificates(self):
+        template = SimpleUploadedFile("teste.png", b"template_content", content_type="image/png")
+        existente = Certificado.objects.create(template=template, participante=self.user, evento=self.evento)
+        self.assertEqual(list(self.evento.participantes_sem_certificado()), [self.other_user])
+
+        self.client.login(username='testuser', password='Password12345')
+        self.client.get(self.url)
+        call_command('processar_certificados', once=True, stdout=StringIO())
+
+        self.assertEqual(TarefaCertificados.objects.get(evento=self.evento).total, 1)
+        self.assertEqual(Certificado.objects.filter(evento=self.evento).count(), 2)
+        self.assertTrue(Certificado.objects.filter(pk=existente.pk, template=existente.template.name).exists())
+        self.assertFalse(self.evento.participantes_sem_certificado().exists())
+
+    @override_settings(CERTIFICADOS_FORMATO='jpeg')
+    def test_certificates_are_stored_in_configured_format(self):
+        self.client.login(username='testuser', password='Password12345')
+        self.client.get(self.url)
+        call_command('processar_certificados', once=True, stdout=StringIO())
+
+        for certificado in Certificado.objects.filter(evento=self.evento):
+            self.assertTrue(certificado.template.name.endswith('.jpg'))
+            with certificado.template.open('rb') as arquivo:
+                self.assertEqual(arquivo.read(2), b'\xff\xd8')
+
+    @override_settings(CERTIFICADOS_SOB_DEMANDA=True)
+    def test_on_demand_generation_only_records_inputs(self):
+        self.client.login(username='testuser', password='Password12345')
+        response = self.client.get(self.url)
+
+        messages = list(response.wsgi_request._messages)
+        self.assertEqual(str(messages[0]), 'Certificados gerados com sucesso')
+        self.assertFalse(TarefaCertificados.objects.exists())
+
+        certificados = Certificado.objects.filter(evento=self.evento)
+        self.assertEqual(certificados.count(), 2)
+        for certificado in certificados:
+            self.assertFalse(certificado.template)
+            self.assertEqual(certificado.nome_evento, 'Test Event')
+            self.assertEqual(certificado.carga_horaria, 8)
+
+    def test_generation_run_twice_for_the_same_event(self):
+        with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root):
+            gerar_certificados(self.evento)
+            # segunda geração que leu os pendentes antes de a primeira gravar (tarefa retomada)
+            with mock.patch.object(Evento, 'participantes_sem_certificado', lambda evento: evento.participantes.all()):
+                gerar_certificados(self.evento)
+            arquivos = [nome for _, _, nomes in os.walk(media_root) for nome in nomes]
+
+        certificados = Certificado.objects.filter(evento=self.evento)
+        self.assertEqual(certificados.count(), 2)
+        self.evento.refresh_from_db()
+        self.assertEqual(self.evento.total_certificados, 2)
+        # as imagens renderizadas pela segunda geração foram removidas
+        self.assertEqual(sorted(arquivos), sorted(os.path.basename(c.template.name) for c in certificados))
+
+    @override_settings(CERTIFICADOS_SOB_DEMANDA=True)
+    def test_on_demand_generation_clicked_twice(self):
+        self.client.login(username='testuser', password='Password12345')
+        self.client.get(self.url)
+        with mock.patch.object(Evento, 'participantes_sem_certificado', lambda evento: evento.participantes.all()):
+            response = self.client.get(self.url)
+
+        self.assertEqual(str(list(response.wsgi_request._messages)[-1]), 'Certificados gerados com sucesso')
+        self.assertEqual(Certificado.objects.filter(evento=self.evento).count(), 2)
+        self.evento.refresh_from_db()
+        self.assertEqual(self.evento.total_certificados, 2)
+
+    @override_settings(CERTIFICADOS_SOB_DEMANDA=True)
+    def test_on_demand_generation_error_is_reported(self):
+        self.client.login(username='testuser', password='Password12345')
+        with mock.patch('eventos.views.gerar_certificados', side_effect=OperationalError('database is locked')):
+            response = self.client.get(self.url)
+
+        self.assertRedirects(response, reverse('certificados_evento', args=[self.evento.slug]))
+        self.assertEqual(str(list(response.wsgi_request._messages)[0]), 'Erro ao gerar certificados.')
+
+    def test_pending_task_is_reused(self):
+        self.client.login(username='testuser', password='Password12345')
+        self.client.get(self.url)
+        self.client.get(self.url)
+
+        self.assertEqual(TarefaCertificados.objects.filter(evento=self.evento).count(), 1)
+
+    @override_settings(CERTIFICADOS_TAREFA_TIMEOUT=600)
+    def test_task_abandoned_by_dead_worker_is_reclaimed(self):
+        tarefa = TarefaCertificados.objects.create(
+            evento=self.evento, status=TarefaCertificados.PROCESSANDO, total=2, processados=1)
+
+        # em processamento há pouco tempo: outro worker ainda pode estar trabalhando nela
+        call_command('processar_certificados', once=True, stdout=StringIO())
+        tarefa.refresh_from_db()
+        self.assertEqual(tarefa.status, TarefaCertificados.PROCESSANDO)
+
+        TarefaCertificados.objects.filter(id=tarefa.id).update(
+            atualizada_em=timezone.now() - timedelta(seconds=601))
+        self.client.login(username='testuser', password='Password12345')
+        self.client.get(self.url)
+        call_command('processar_certificados', once=True, stdout=StringIO())
+
+        tarefa = TarefaCertificados.objects.get(evento=self.evento)
+        self.assertEqual(tarefa.status, TarefaCertificados.CONCLUIDA)
+        self.assertEqual(tarefa.processados, 2)
+        self.assertFalse(self.evento.participantes_sem_certificado().exists())
+
+    @override_settings(CERTIFICADOS_TAREFA_TIMEOUT=600, CERTIFICADOS_SOB_DEMANDA=True)
+    def test_worker_stops_when_its_task_is_reclaimed(self):
+        TarefaCertificados.objects.create(evento=self.evento)
+        tarefa = reservar_proxima_tarefa()
+
+        # sem batimento por mais que o timeout: outro worker retoma a tarefa
+        TarefaCertificados.objects.filter(id=tarefa.id).update(
+            atualizada_em=timezone.now() - timedelta(seconds=601))
+        retomada = reservar_proxima_tarefa()
+        self.assertEqual(retomada.id, tarefa.id)
+
+        # o worker anterior ainda está vivo: grava o lote em andamento e para no batimento
+        executar_tarefa(tarefa)
+        self.assertEqual(TarefaCertificados.objects.get(id=tarefa.id).status, TarefaCertificados.PROCESSANDO)
+
+        executar_tarefa(retomada)
+        self.assertEqual(TarefaCertificados.objects.get(id=tarefa.id).status, TarefaCertificados.CONCLUIDA)
+        self.assertEqual(Certificado.objects.filter(evento=self.evento).count(), 2)
+        self.evento.refresh_from_db()
+        self.assertEqual(self.evento.total_certificados, 2)
+
+    @override_settings(CERTIFICADOS_SOB_DEMANDA=True, CERTIFICADOS_LOTE=1)
+    def test_each_batch_refreshes_the_heartbeat(self):
+        TarefaCertificados.objects.create(evento=self.evento)
+        tarefa = reservar_proxima_tarefa()
+        TarefaCertificados.objects.filter(id=tarefa.id).update(atualizada_em=timezone.now() - timedelta(days=1))
+        batimentos = []
+        gravar = Certificado.objects.bulk_create
+
+        def ao_gravar(*args, **kwargs):
+            batimentos.append(TarefaCertificados.objects.get(id=tarefa.id).atualizada_em)
+            return gravar(*args, **kwargs)
+
+        with mock.patch.object(Certificado.objects, 'bulk_create', ao_gravar):
+            executar_tarefa(tarefa)
+
+        # o segundo lote já encontra o batimento renovado pelo primeiro
+        self.assertEqual(len(batimentos), 2)
+        self.assertEqual(Certificado.objects.filter(evento=self.evento).count(), 2)
+        self.assertGreater(batimentos[1], timezone.now() - timedelta(minutes=1))
+
+
+class ProgressoCertificadosViewTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='testuser', password='Password12345')
+        cls.other_user = User.objects.create_user(username='otheruser', password='Otherpass123')
+        cls.evento = Evento.objects.create(
+            criador=cls.user,
+            nome=f'Test Event',
+            slug=f'test-event',
+            descricao=f'This is a test event',
+            data_inicio='2023-01-01',
+            data_termino='2023-01-02',
+            carga_horaria=8,
+            cor_principal='#ffffff',
+            cor_secundaria='#000000',
+            cor_fundo='#cccccc'
+        )
+        cls.url = reverse('progresso_certificados', args=[cls.evento.slug])
+
+    def test_progress_without_task(self):
+        self.client.login(username='testuser', password='Password12345')
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'status': None})
+
+    def test_progress_of_latest_task(self):
+        self.client.login(username='testuser', password='Password12345')
+        TarefaCertificados.objects.create(
+            evento=self.evento, status=TarefaCertificados.PROCESSANDO, total=10, processados=4)
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.json(), {'tipo': 'geracao', 'status': 'processando', 'total': 10, 'processados': 4,
+                                           'erro': ''})
+
+    def test_error_details_are_not_sent_to_the_browser(self):
+        self.client.login(username='testuser', password='Password12345')
+        TarefaCertificados.objects.create(
+            evento=self.evento, status=TarefaCertificados.ERRO, erro='/srv/media/certificados: Permission denied')
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.json()['erro'], 'Erro ao gerar certificados.')
+        self.assertNotIn('Permission denied', response.content.decode())
+
+    def test_status_code_404_if_user_is_not_event_creator(self):
+        self.client.login(username='otheruser', password='Otherpass123')
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 404)
+
 
 class ProcurarCertificadoViewTestCase(TestCase):
     @classmethod
@@ -396,3 +1104,243 @@ class ProcurarCertificadoViewTestCase(TestCase):
         response = self.client.post(self.url, data={'email': 'participante@example.com'})
 
         self.assertEqual(response.url, certificado.template.url)
+
+    def test_certificado_is_found_regardless_of_email_case(self):
+        self.client.login(username='testuser', password='Password12345')
+        participante = User.objects.create_user(username='participante', email='Participante@example.com')
+        certificado = Certificado.objects.create(evento=self.evento, participante=participante)
+        response = self.client.post(self.url, data={'email': 'PARTICIPANTE@Example.com '})
+
+        self.assertEqual(response.url, certificado.imagem_url)
+
+
+class ImagemCertificadoViewTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='testuser', password='Password12345')
+        cls.participante = User.objects.create_user(username='participante', password='Password12345')
+        cls.other_user = User.objects.create_user(username='otheruser', password='Otherpass123')
+        cls.evento = Evento.objects.create(
+            criador=cls.user,
+            nome=f'Test Event',
+            slug=f'test-event',
+            descricao=f'This is a test event',
+            data_inicio='2023-01-01',
+            data_termino='2023-01-02',
+            carga_horaria=8,
+            cor_principal='#ffffff',
+            cor_secundaria='#000000',
+            cor_fundo='#cccccc'
+        )
+        cls.certificado = Certificado.objects.create(
+            participante=cls.participante,
+            evento=cls.evento,
+            nome_evento=cls.evento.nome,
+            carga_horaria=cls.evento.carga_horaria
+        )
+        cls.url = reverse('imagem_certificado', args=[cls.certificado.id])
+
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.cache_dir.cleanup)
+        self.settings_override = override_settings(CERTIFICADOS_CACHE_DIR=self.cache_dir.name)
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+
+    def test_on_demand_certificate_is_rendered_and_cached(self):
+        self.client.login(username='participante', password='Password12345')
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'image/png')
+        self.assertTrue(b''.join(response.streaming_content).startswith(b'\x89PNG'))
+        self.assertEqual(sum(len(arquivos) for _, _, arquivos in os.walk(self.cache_dir.name)), 1)
+
+    def test_event_creator_can_see_certificate(self):
+        self.client.login(username='testuser', password='Password12345')
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(b''.join(response.streaming_content))
+
+    def test_status_code_404_if_certificate_is_not_users(self):
+        self.client.login(username='otheruser', password='Otherpass123')
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_stored_certificate_redirects_to_file(self):
+        template = SimpleUploadedFile("teste.png", b"template_content", content_type="image/png")
+        certificado = self.certificado
+        certificado.template = template
+        certificado.save()
+        self.client.login(username='participante', password='Password12345')
+        response = self.client.get(reverse('imagem_certificado', args=[certificado.id]))
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response.url, certificado.template.url)
+
+
+class BaixarCertificadosViewTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='testuser', password='Password12345')
+        cls.other_user = User.objects.create_user(username='otheruser', password='Otherpass123')
+        cls.evento = Evento.objects.create(
+            criador=cls.user,
+            nome=f'Test Event',
+            slug=f'test-event',
+            descricao=f'This is a test event',
+            data_inicio='2023-01-01',
+            data_termino='2023-01-02',
+            carga_horaria=8,
+            cor_principal='#ffffff',
+            cor_secundaria='#000000',
+            cor_fundo='#cccccc'
+        )
+        template = SimpleUploadedFile("teste.png", b"template_content", content_type="image/png")
+        Certificado.objects.create(template=template, participante=cls.user, evento=cls.evento)
+        Certificado.objects.create(participante=cls.other_user, evento=cls.evento,
+                                   nome_evento=cls.evento.nome, carga_horaria=cls.evento.carga_horaria)
+        cls.url = reverse('baixar_certificados', args=[cls.evento.slug])
+
+    def test_zip_contains_every_certificate_uncompressed(self):
+        self.client.login(username='testuser', password='Password12345')
+        with tempfile.TemporaryDirectory() as cache_dir, override_settings(CERTIFICADOS_CACHE_DIR=cache_dir):
+            response = self.client.get(self.url)
+            conteudo = b''.join(response.streaming_content)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/zip')
+        self.assertIn('certificados-test-event.zip', response['Content-Disposition'])
+
+        with zipfile.ZipFile(BytesIO(conteudo)) as arquivo_zip:
+            self.assertEqual(sorted(arquivo_zip.namelist()), ['otheruser.png', 'testuser.png'])
+            self.assertEqual(arquivo_zip.read('testuser.png'), b'template_content')
+            self.assertTrue(arquivo_zip.read('otheruser.png').startswith(b'\x89PNG'))
+            for info in arquivo_zip.infolist():
+                self.assertEqual(info.compress_type, zipfile.ZIP_STORED)
+
+    def test_status_code_404_if_user_is_not_event_creator(self):
+        self.client.login(username='otheruser', password='Otherpass123')
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 404)
+
+
+class PdfCertificadosViewTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='testuser', password='Password12345')
+        cls.other_user = User.objects.create_user(username='otheruser', password='Otherpass123')
+        cls.evento = Evento.objects.create(
+            criador=cls.user,
+            nome=f'Test Event',
+            slug=f'test-event',
+            descricao=f'This is a test event',
+            data_inicio='2023-01-01',
+            data_termino='2023-01-02',
+            carga_horaria=8,
+            cor_principal='#ffffff',
+            cor_secundaria='#000000',
+            cor_fundo='#cccccc'
+        )
+        cls.url = reverse('pdf_certificados', args=[cls.evento.slug])
+
+    def setUp(self):
+        self.pdf_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.pdf_dir.cleanup)
+        self.settings_override = override_settings(CERTIFICADOS_PDF_DIR=self.pdf_dir.name, CERTIFICADOS_PDF_LOTE=2)
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+
+    def _criar_certificado(self, username):
+        participante = User.objects.create_user(username=username)
+        template = SimpleUploadedFile(f"{username}.png", gerar_imagem_certificado(username, 'Test Event', 8))
+        return Certificado.objects.create(template=template, participante=participante, evento=self.evento)
+
+    def _baixar_pdf(self):
+        response = self.client.get(self.url)
+        if response.status_code == 302:
+            # PDF fora do cache: a view enfileira a montagem e o worker grava o arquivo
+            call_command('processar_certificados', once=True, stdout=StringIO())
+            response = self.client.get(self.url)
+        return response, b''.join(response.streaming_content)
+
+    def test_pdf_is_built_by_the_worker(self):
+        self._criar_certificado('participante1')
+        self.client.login(username='testuser', password='Password12345')
+        response = self.client.get(self.url)
+
+        self.assertRedirects(response, reverse('certificados_evento', args=[self.evento.slug]))
+        messages = list(response.wsgi_request._messages)
+        self.assertEqual(str(messages[0]), 'O PDF está sendo gerado. Baixe-o novamente quando a geração terminar.')
+        self.assertEqual(os.listdir(self.pdf_dir.name), [])
+
+        # pedidos repetidos enquanto a montagem está na fila não criam outra tarefa
+        self.client.get(self.url)
+        tarefa = TarefaCertificados.objects.get(evento=self.evento)
+        self.assertEqual(tarefa.tipo, TarefaCertificados.PDF)
+
+        call_command('processar_certificados', once=True, stdout=StringIO())
+        tarefa.refresh_from_db()
+        self.assertEqual(tarefa.status, TarefaCertificados.CONCLUIDA)
+        self.assertEqual((tarefa.total, tarefa.processados), (1, 1))
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(PdfParser(buf=b''.join(response.streaming_content)).pages), 1)
+
+    def test_pdf_has_one_page_per_certificate(self):
+        for i in range(3):
+            self._criar_certificado(f'participante{i}')
+        self.client.login(username='testuser', password='Password12345')
+        response, conteudo = self._baixar_pdf()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertEqual(len(PdfParser(buf=conteudo).pages), 3)
+
+    def test_pdf_is_written_in_a_single_pass(self):
+        for i in range(5):
+            self._criar_certificado(f'participante{i}')
+        progresso = []
+
+        with mock.patch.object(Image.Image, 'save', autospec=True, side_effect=Image.Image.save) as salvar:
+            caminho = pdf_certificados(self.evento, progresso.append)
+
+        # um lote por CERTIFICADOS_PDF_LOTE páginas, sem regravar o arquivo a cada lote:
+        # cada página é codificada uma única vez
+        self.assertEqual(progresso, [2, 2, 1])
+        self.assertEqual([chamada.kwargs['format'] for chamada in salvar.call_args_list], ['JPEG'] * 5)
+        with open(caminho, 'rb') as arquivo:
+            self.assertEqual(len(PdfParser(buf=arquivo.read()).pages), 5)
+
+    def test_pdf_is_cached_until_certificates_change(self):
+        self._criar_certificado('participante1')
+        self.client.login(username='testuser', password='Password12345')
+        self._baixar_pdf()
+        arquivos = os.listdir(self.pdf_dir.name)
+
+        self._baixar_pdf()
+        self.assertEqual(os.listdir(self.pdf_dir.name), arquivos)
+
+        self._criar_certificado('participante2')
+        _, conteudo = self._baixar_pdf()
+        self.assertNotEqual(os.listdir(self.pdf_dir.name), arquivos)
+        self.assertEqual(len(os.listdir(self.pdf_dir.name)), 1)
+        self.assertEqual(len(PdfParser(buf=conteudo).pages), 2)
+
+    def test_event_without_certificates(self):
+        self.client.login(username='testuser', password='Password12345')
+        response = self.client.get(self.url)
+
+        self.assertRedirects(response, reverse('certificados_evento', args=[self.evento.slug]))
+        messages = list(response.wsgi_request._messages)
+        self.assertEqual(str(messages[0]), 'Não há certificados para exportar.')
+
+    def test_status_code_404_if_user_is_not_event_creator(self):
+        self.client.login(username='otheruser', password='Otherpass123')
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 404)
@@ -7,9 +7,15 @@ urlpatterns = [
     path('novo_evento/', views.novo_evento, name='novo_evento'),
     path('gerenciar_eventos/', views.gerenciar_eventos, name='gerenciar_eventos'),
     path('inscricao/<slug:slug>/', views.inscricao, name='inscricao'),
+    path('cancelar_inscricao/<slug:slug>/', views.cancelar_inscricao, name='cancelar_inscricao'),
     path('participantes_evento/<slug:slug>/', views.participantes_evento, name='participantes_evento'),
+    path('importar_participantes/<slug:slug>/', views.importar_participantes, name='importar_participantes'),
     path('exportar_csv/<slug:slug>/', views.exportar_csv, name='exportar_csv'),
     path('certificados_evento/<slug:slug>/', views.certificados_evento, name='certificados_evento'),
     path('gerar_certificado/<slug:slug>/', views.gerar_certificado, name='gerar_certificado'),
+    path('progresso_certificados/<slug:slug>/', views.progresso_certificados, name='progresso_certificados'),
     path('procurar_certificado/<slug:slug>/', views.procurar_certificado, name='procurar_certificado'),
+    path('baixar_certificados/<slug:slug>/', views.baixar_certificados, name='baixar_certificados'),
+    path('pdf_certificados/<slug:slug>/', views.pdf_certificados_evento, name='pdf_certificados'),
+    path('certificado/<int:id>/', views.imagem_certificado, name='imagem_certificado'),
 ]
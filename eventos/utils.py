@@ -1,8 +1,9 @@
 from django.contrib import messages
+from django.db.models import Q
 
 
 def evento_is_valid(request, nome, descricao, data_inicio, data_termino, carga_horaria,
-                 logo, cor_principal, cor_secundaria, cor_fundo):
+                 logo, cor_principal, cor_secundaria, cor_fundo, capacidade=None):
 
     if (not logo or len(nome.strip()) == 0 or len(descricao.strip()) == 0
             or len(data_inicio.strip()) == 0 or len(data_termino.strip()) == 0
@@ -17,4 +18,63 @@ def evento_is_valid(request, nome, descricao, data_inicio, data_termino, carga_h
             request, message='A logo do evento deve ter menos de 10MB.')
         return False
 
+    # vazia significa sem limite; zero colocaria todos os inscritos na lista de espera
+    if capacidade and (not capacidade.isdigit() or int(capacidade) < 1):
+        messages.error(
+            request, message='A capacidade deve ser um número inteiro maior que zero.')
+        return False
+
     return True
+
+
+def filtro_prefixo(campo, prefixo):
+    """
+    filtra por prefixo com um intervalo (campo >= prefixo AND campo < prefixo + U+10FFFF),
+    que usa o índice B-tree da coluna em qualquer banco, ao contrário de LIKE 'prefixo%'
+    """
+    return Q(**{f'{campo}__gte': prefixo, f'{campo}__lt': prefixo + '\U0010ffff'})
+
+
+def paginar_por_cursor(queryset, apos, antes, por_pagina):
+    """
+    paginação por keyset no id: retorna (página, cursor anterior, cursor próximo).
+    O custo de uma página não depende da sua posição, ao contrário de OFFSET.
+    """
+    if antes.isdigit():
+        pagina = list(queryset.filter(id__lt=int(antes)).order_by('-id')[:por_pagina + 1])
+        tem_anterior = len(pagina) > por_pagina
+        pagina = pagina[:por_pagina][::-1]
+        tem_proxima = True
+    else:
+        if apos.isdigit():
+            queryset = queryset.filter(id__gt=int(apos))
+        pagina = list(queryset.order_by('id')[:por_pagina + 1])
+        tem_proxima = len(pagina) > por_pagina
+        pagina = pagina[:por_pagina]
+        tem_anterior = apos.isdigit()
+
+    cursor_anterior = pagina[0].id if pagina and tem_anterior else None
+    cursor_proxima = pagina[-1].id if pagina and tem_proxima else None
+    return pagina, cursor_anterior, cursor_proxima
+
+
+def aceita_codificacao(accept_encoding, codificacao):
+    """
+    diz se o cabeçalho Accept-Encoding aceita a codificação, respeitando os valores q:
+    "gzip;q=0" recusa o gzip e "*" vale para as codificações não citadas
+    """
+    qualidades = {}
+    for item in accept_encoding.split(','):
+        nome, *parametros = (parte.strip() for parte in item.split(';'))
+        qualidade = 1.0
+        for parametro in parametros:
+            chave, _, valor = parametro.partition('=')
+            if chave.strip().lower() == 'q':
+                try:
+                    qualidade = float(valor)
+                except ValueError:
+                    qualidade = 0.0
+        if nome:
+            qualidades[nome.lower()] = qualidade
+
+    return qualidades.get(codificacao, qualidades.get('*', 0.0)) > 0
@@ -1,20 +1,32 @@
 import csv
-import os
-import sys
-from io import BytesIO
-from secrets import token_urlsafe
 
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.core.files.uploadedfile import InMemoryUploadedFile
-from django.http import Http404
+from django.contrib.auth.models import User
+from django.db import DatabaseError
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.http import FileResponse, Http404, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
-from django.utils.text import slugify
-from PIL import Image, ImageDraw, ImageFont
-
-from .models import Certificado, Evento
-from .utils import evento_is_valid
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_sequence, slugify
+
+from .busca import buscar_eventos
+from .cache_certificados import caminho_em_cache
+from .certificados import formato_certificado
+from .exportacao import (COLUNAS_EXPORTACAO, COLUNAS_PADRAO, FORMATOS_EXPORTACAO, caminho_pdf_certificados,
+                         serializar_participantes, zip_certificados)
+from .importacao import importar_participantes as importar
+from .inscricoes import EM_ESPERA, JA_INSCRITO, inscrever
+from .inscricoes import cancelar_inscricao as cancelar
+from .models import Certificado, Evento, ListaEspera, TarefaCertificados
+from .tarefas import enfileirar_geracao, gerar_certificados
+from .utils import aceita_codificacao, evento_is_valid, filtro_prefixo, paginar_por_cursor
+
+EVENTOS_POR_PAGINA = 20
+PAGINAS_BUSCA = 50
+PARTICIPANTES_POR_PAGINA = 50
 
 
 @login_required(login_url='login')
@@ -25,6 +37,7 @@ def novo_evento(request):
         data_inicio = request.POST["data_inicio"]
         data_termino = request.POST["data_termino"]
         carga_horaria = request.POST["carga_horaria"]
+        capacidade = request.POST.get("capacidade", "").strip()
 
         logo = request.FILES.get("logo")
 
@@ -33,7 +46,7 @@ def novo_evento(request):
         cor_fundo = request.POST["cor_fundo"]
 
         if not evento_is_valid(request, nome, descricao, data_inicio, data_termino,
-                               carga_horaria, logo, cor_principal, cor_secundaria, cor_fundo):
+                               carga_horaria, logo, cor_principal, cor_secundaria, cor_fundo, capacidade):
             return redirect(to='novo_evento')
 
         try:
@@ -44,6 +57,7 @@ def novo_evento(request):
                 data_inicio=data_inicio,
                 data_termino=data_termino,
                 carga_horaria=carga_horaria,
+                capacidade=int(capacidade) if capacidade else None,
                 logo=logo,
                 cor_principal=cor_principal,
                 cor_secundaria=cor_secundaria,
@@ -58,20 +72,43 @@ def novo_evento(request):
 
         except:
             messages.error(request, message='Erro interno do sistema.')
-            return request(to='novo_evento')
+            return redirect(to='novo_evento')
 
     return render(request, 'novo_evento.html')
 
 
 @login_required(login_url='login')
 def gerenciar_eventos(request):
+    # os totais vêm dos contadores do próprio evento: a página é uma única consulta,
+    # sem JOIN ou subconsulta por linha, qualquer que seja o tamanho dos eventos
     eventos = Evento.objects.filter(criador=request.user)
 
-    filtro_titulo = request.GET.get('titulo')
+    filtro_titulo = request.GET.get('titulo', '')
+    cursor_anterior = cursor_proxima = pagina_anterior = pagina_proxima = None
     if filtro_titulo:
-        eventos = eventos.filter(nome__icontains=filtro_titulo)
+        # ordenar por relevância já exige ler todos os resultados, então a página é escolhida
+        # por OFFSET; o número de páginas é limitado e buscas mais amplas devem ser refinadas
+        numero = request.GET.get('pagina', '')
+        numero = min(int(numero), PAGINAS_BUSCA) if numero.isdigit() and int(numero) > 0 else 1
+        inicio = (numero - 1) * EVENTOS_POR_PAGINA
+        pagina = list(buscar_eventos(eventos, filtro_titulo)[inicio:inicio + EVENTOS_POR_PAGINA + 1])
+        if len(pagina) > EVENTOS_POR_PAGINA and numero < PAGINAS_BUSCA:
+            pagina_proxima = numero + 1
+        pagina = pagina[:EVENTOS_POR_PAGINA]
+        pagina_anterior = numero - 1 or None
+    else:
+        pagina, cursor_anterior, cursor_proxima = paginar_por_cursor(
+            eventos, request.GET.get('apos', ''), request.GET.get('antes', ''), EVENTOS_POR_PAGINA)
 
-    return render(request, 'gerenciar_eventos.html', {'eventos': eventos})
+    context = {
+        'eventos': pagina,
+        'titulo': filtro_titulo,
+        'cursor_anterior': cursor_anterior,
+        'cursor_proxima': cursor_proxima,
+        'pagina_anterior': pagina_anterior,
+        'pagina_proxima': pagina_proxima
+    }
+    return render(request, 'gerenciar_eventos.html', context)
 
 
 @login_required(login_url='login')
@@ -79,54 +116,147 @@ def inscricao(request, slug):
     evento = get_object_or_404(Evento, slug=slug)
 
     if request.method == 'POST':
-        if request.user in evento.participantes.all():
+        resultado = inscrever(evento, request.user)
+
+        if resultado == JA_INSCRITO:
             messages.error(request, message='Você já se inscreveu neste evento.')
-            return redirect(to='inscricao', slug=slug)
+        elif resultado == EM_ESPERA:
+            messages.warning(request, message='Evento lotado. Você está na lista de espera.')
+        else:
+            messages.success(request, message='Inscrição realizada com sucesso.')
 
-        evento.participantes.add(request.user)
-        evento.save()
-        messages.success(request, message='Inscrição realizada com sucesso.')
         return redirect(to='inscricao', slug=slug)
     else:
-        return render(request, 'inscricao_evento.html', {'evento': evento})
+        inscrito = evento.participantes.filter(pk=request.user.pk).exists()
+        em_espera = not inscrito and ListaEspera.objects.filter(evento=evento, participante=request.user).exists()
+
+        context = {
+            'evento': evento,
+            'inscrito': inscrito,
+            'em_espera': em_espera
+        }
+        return render(request, 'inscricao_evento.html', context)
+
+
+@login_required(login_url='login')
+def cancelar_inscricao(request, slug):
+    evento = get_object_or_404(Evento, slug=slug)
+
+    if request.method == 'POST':
+        if cancelar(evento, request.user):
+            messages.success(request, message='Inscrição cancelada.')
+        else:
+            messages.error(request, message='Você não está inscrito neste evento.')
+
+    return redirect(to='inscricao', slug=slug)
 
 
 @login_required(login_url='login')
 def participantes_evento(request, slug):
     evento = get_object_or_404(Evento, slug=slug)
-    participantes = evento.participantes.all()
 
-    if evento.criador != request.user:
+    if evento.criador_id != request.user.id:
         raise Http404('Esse evento não é seu.')
 
+    busca = request.GET.get('busca', '').strip()
+    inscricoes = Evento.participantes.through.objects.filter(evento=evento).select_related('user')
+
+    if busca:
+        # o e-mail guarda as maiúsculas do endereço; a busca usa o índice de LOWER(email)
+        # criado em usuarios/migrations/0001_email_unico.py, que só cobre email > ''
+        usuarios = User.objects.alias(email_normalizado=Lower('email')).filter(
+            filtro_prefixo('username', busca) | (filtro_prefixo('email_normalizado', busca.lower()) & Q(email__gt='')))
+        inscricoes = inscricoes.filter(user__in=usuarios.values('id'))
+
+    # o cursor é o id da tabela de inscrições, na ordem em que os participantes se inscreveram
+    pagina, cursor_anterior, cursor_proxima = paginar_por_cursor(
+        inscricoes, request.GET.get('apos', ''), request.GET.get('antes', ''), PARTICIPANTES_POR_PAGINA)
+
     context = {
         'evento': evento,
-        'participantes': participantes,
-        'num_participantes': participantes[:5]
+        'participantes': [inscricao.user for inscricao in pagina],
+        'busca': busca,
+        'cursor_anterior': cursor_anterior,
+        'cursor_proxima': cursor_proxima,
+        'formatos_exportacao': FORMATOS_EXPORTACAO,
+        'colunas_exportacao': COLUNAS_EXPORTACAO
     }
 
     return render(request, 'participantes_evento.html', context)
 
 
 @login_required(login_url='login')
-def exportar_csv(request, slug):
+def importar_participantes(request, slug):
     evento = get_object_or_404(Evento, slug=slug)
 
-    if evento.criador != request.user:
+    if evento.criador_id != request.user.id:
         raise Http404('Esse evento não é seu.')
 
-    participantes = evento.participantes.all()
+    if request.method == 'GET':
+        return render(request, 'importar_participantes.html', {'evento': evento})
 
-    token = f'{token_urlsafe(6)}.csv'
-    path = os.path.join(settings.MEDIA_ROOT, token)
+    arquivo = request.FILES.get('arquivo')
 
-    with open(path, 'w') as arq:
-        writer = csv.writer(arq, delimiter=",")
-        for participante in participantes:
-            x = (participante.username, participante.email)
-            writer.writerow(x)
+    if not arquivo:
+        messages.error(request, message='Selecione um arquivo CSV.')
+        return redirect(to='importar_participantes', slug=slug)
 
-    return redirect(f'/media/{token}')
+    try:
+        relatorio = importar(evento, arquivo)
+    except (UnicodeDecodeError, csv.Error):
+        messages.error(request, message='O arquivo deve ser um CSV em UTF-8.')
+        return redirect(to='importar_participantes', slug=slug)
+
+    messages.success(request, message=f'{relatorio.inscritos} participante(s) inscrito(s).')
+    context = {
+        'evento': evento,
+        'relatorio': relatorio
+    }
+    return render(request, 'importar_participantes.html', context)
+
+
+@login_required(login_url='login')
+def exportar_csv(request, slug):
+    evento = get_object_or_404(Evento, slug=slug)
+
+    if evento.criador != request.user:
+        raise Http404('Esse evento não é seu.')
+
+    formato = request.GET.get('formato', 'csv')
+    # aceita tanto ?colunas=username,email quanto ?colunas=username&colunas=email
+    colunas = tuple(coluna for valor in request.GET.getlist('colunas') for coluna in valor.split(',') if coluna)
+    colunas = colunas or COLUNAS_PADRAO
+
+    if formato not in FORMATOS_EXPORTACAO or not set(colunas) <= set(COLUNAS_EXPORTACAO):
+        messages.error(request, message='Formato ou colunas de exportação inválidos.')
+        return redirect(to='participantes_evento', slug=slug)
+
+    participantes = evento.participantes.order_by('id').values_list(*colunas)
+    conteudo = serializar_participantes(
+        participantes.iterator(chunk_size=settings.EXPORTACAO_CHUNK_SIZE),
+        formato,
+        colunas,
+        cabecalho=bool(request.GET.get('cabecalho'))
+    )
+    extensao, content_type = FORMATOS_EXPORTACAO[formato]
+    nome_arquivo = f'participantes-{evento.slug}.{extensao}'
+
+    if request.GET.get('gzip'):
+        # arquivo .gz para download
+        response = StreamingHttpResponse(compress_sequence(texto.encode() for texto in conteudo),
+                                         content_type='application/gzip')
+        nome_arquivo += '.gz'
+    elif aceita_codificacao(request.headers.get('Accept-Encoding', ''), 'gzip'):
+        # compressão apenas no transporte
+        response = StreamingHttpResponse(compress_sequence(texto.encode() for texto in conteudo),
+                                         content_type=content_type)
+        response['Content-Encoding'] = 'gzip'
+    else:
+        response = StreamingHttpResponse(conteudo, content_type=content_type)
+
+    patch_vary_headers(response, ('Accept-Encoding',))
+    response['Content-Disposition'] = f'attachment; filename="{nome_arquivo}"'
+    return response
 
 
 @login_required(login_url='login')
@@ -136,12 +266,14 @@ def certificados_evento(request, slug):
     if evento.criador != request.user:
         raise Http404('Esse evento não é seu.')
 
-    quantidade_certificados = evento.participantes.all().count(
-    ) - Certificado.objects.filter(evento=evento).count()
+    quantidade_certificados = evento.certificados_pendentes
+
+    tarefa = TarefaCertificados.objects.filter(evento=evento).order_by('-id').first()
 
     context = {
         'evento': evento,
-        'quantidade_certificados': quantidade_certificados
+        'quantidade_certificados': quantidade_certificados,
+        'tarefa': tarefa
     }
 
     return render(request, 'certificados_evento.html', context)
@@ -154,60 +286,109 @@ def gerar_certificado(request, slug):
     if evento.criador != request.user:
         raise Http404('Esse evento não é seu.')
 
-    path_template = os.path.join(
-        settings.BASE_DIR, 'templates/static/eventos/img/template_certificado.png')
-    path_fonte = os.path.join(
-        settings.BASE_DIR, 'templates/static/eventos/fonts/arimo.ttf')
-    for participante in evento.participantes.all():
-        img = Image.open(path_template)
-        draw = ImageDraw.Draw(img)
-        fonte_nome = ImageFont.truetype(path_fonte, 60)
-        fonte_info = ImageFont.truetype(path_fonte, 30)
-        draw.text((230, 651), f"{participante.username}",
-                  font=fonte_nome, fill=(0, 0, 0))
-        draw.text((761, 782), f"{evento.nome}",
-                  font=fonte_info, fill=(0, 0, 0))
-        draw.text((816, 849), f"{evento.carga_horaria} horas",
-                  font=fonte_info, fill=(0, 0, 0))
-        output = BytesIO()
-        img.save(output, format="PNG", quality=100)
-        output.seek(0)
-        img_final = InMemoryUploadedFile(
-            output,
-            'ImageField',
-            f'{token_urlsafe(8)}.png',
-            'image/jpeg',
-            sys.getsizeof(output),
-            None
-        )
+    if settings.CERTIFICADOS_SOB_DEMANDA:
         try:
-            if not Certificado.objects.filter(participante=participante).filter(evento=evento).exists():
-                certificado_gerado = Certificado(
-                    template=img_final,
-                    participante=participante,
-                    evento=evento,
-                )
-                certificado_gerado.save()
-        except:
+            gerar_certificados(evento)
+        except DatabaseError:
             messages.error(request, message='Erro ao gerar certificados.')
             return redirect(to='certificados_evento', slug=slug)
+        messages.success(request, message='Certificados gerados com sucesso')
+        return redirect(to='certificados_evento', slug=slug)
+
+    enfileirar_geracao(evento)
 
-    messages.success(request, message='Certificados gerados com sucesso')
+    messages.success(request, message='A geração dos certificados foi iniciada.')
     return redirect(to='certificados_evento', slug=slug)
 
 
+@login_required(login_url='login')
+def progresso_certificados(request, slug):
+    evento = get_object_or_404(Evento, slug=slug)
+
+    if evento.criador != request.user:
+        raise Http404('Esse evento não é seu.')
+
+    tarefa = TarefaCertificados.objects.filter(evento=evento).order_by('-id').first()
+
+    if not tarefa:
+        return JsonResponse({'status': None})
+
+    return JsonResponse({
+        'tipo': tarefa.tipo,
+        'status': tarefa.status,
+        'total': tarefa.total,
+        'processados': tarefa.processados,
+        # o detalhe da exceção fica registrado na tarefa e no log do worker
+        'erro': 'Erro ao gerar certificados.' if tarefa.erro else '',
+    })
+
+
 def procurar_certificado(request, slug):
     evento = get_object_or_404(Evento, slug=slug)
 
     if evento.criador != request.user:
         raise Http404('Esse evento não é seu.')
 
-    email = request.POST.get('email')
-    certificado = Certificado.objects.filter(
-        evento=evento).filter(participante__email=email).first()
+    email = request.POST.get('email', '').strip().lower()
+    certificado = Certificado.objects.alias(email_normalizado=Lower('participante__email')).filter(
+        evento=evento, email_normalizado=email, participante__email__gt='').first()
 
     if not certificado:
         messages.warning(request, message='Certificado não encontrado.')
         return redirect(to='certificados_evento', slug=slug)
 
-    return redirect(certificado.template.url)
\ No newline at end of file
+    return redirect(certificado.imagem_url)
+
+
+@login_required(login_url='login')
+def baixar_certificados(request, slug):
+    evento = get_object_or_404(Evento, slug=slug)
+
+    if evento.criador != request.user:
+        raise Http404('Esse evento não é seu.')
+
+    certificados = Certificado.objects.filter(evento=evento).select_related('evento', 'participante').order_by('id')
+
+    response = StreamingHttpResponse(zip_certificados(certificados.iterator(chunk_size=500)),
+                                     content_type='application/zip')
+    response['Content-Disposition'] = f'attachment; filename="certificados-{evento.slug}.zip"'
+    return response
+
+
+@login_required(login_url='login')
+def pdf_certificados_evento(request, slug):
+    evento = get_object_or_404(Evento, slug=slug)
+
+    if evento.criador != request.user:
+        raise Http404('Esse evento não é seu.')
+
+    caminho = caminho_pdf_certificados(evento)
+
+    if not caminho:
+        messages.warning(request, message='Não há certificados para exportar.')
+        return redirect(to='certificados_evento', slug=slug)
+
+    try:
+        arquivo = open(caminho, 'rb')
+    except FileNotFoundError:
+        # montar o PDF pode levar mais que o timeout da requisição; o worker o grava no cache
+        enfileirar_geracao(evento, TarefaCertificados.PDF)
+        messages.success(request, message='O PDF está sendo gerado. Baixe-o novamente quando a geração terminar.')
+        return redirect(to='certificados_evento', slug=slug)
+
+    return FileResponse(arquivo, as_attachment=True, filename=f'certificados-{evento.slug}.pdf',
+                        content_type='application/pdf')
+
+
+@login_required(login_url='login')
+def imagem_certificado(request, id):
+    certificado = get_object_or_404(Certificado.objects.select_related('evento', 'participante'), id=id)
+
+    if request.user.id not in (certificado.participante_id, certificado.evento.criador_id):
+        raise Http404('Esse certificado não é seu.')
+
+    if certificado.template:
+        return redirect(certificado.template.url)
+
+    _, content_type = formato_certificado()
+    return FileResponse(open(caminho_em_cache(certificado), 'rb'), content_type=content_type)
\ No newline at end of file
@@ -52,7 +52,7 @@ MIDDLEWARE = [
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'usuarios.middleware.UsuarioEmCacheMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -85,10 +85,84 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # escritas concorrentes esperam o lock em vez de falhar imediatamente
+            'timeout': config('SQLITE_TIMEOUT', default=20, cast=int),
+        },
+        'TEST': {
+            # banco em arquivo: o SQLite em memória compartilhada não espera locks entre threads
+            'NAME': BASE_DIR / 'test_db.sqlite3',
+        },
     }
 }
 
 
+# Authentication
+# https://docs.djangoproject.com/en/4.2/topics/auth/customizing/#specifying-authentication-backends
+
+# login pelo nome de usuário ou pelo e-mail
+AUTHENTICATION_BACKENDS = [
+    'usuarios.backends.UsernameOuEmailBackend',
+]
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+# o LocMemCache é local a cada processo; as sessões cached_db e o cache de usuários só são
+# aceitos com um cache compartilhado (ex.: CACHE_BACKEND=django.core.cache.backends.redis.RedisCache),
+# senão o logout ou a troca de senha feitos em um worker não chegam aos outros (usuarios/checks.py)
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default=''),
+    }
+}
+
+
+# Sessions
+# https://docs.djangoproject.com/en/4.2/topics/http/sessions/
+
+# db: sempre no banco; cached_db: lê a sessão do cache e grava no banco (write-through), exige
+# cache compartilhado; cookies: sessão assinada no próprio cookie, sem banco
+_SESSOES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+SESSION_ENGINE = _SESSOES[config('SESSOES_MODO', default='db')]
+
+# tempo que o usuário autenticado fica no cache (usuarios.middleware.UsuarioEmCacheMiddleware);
+# 0 desativa o cache de usuários, que também exige cache compartilhado
+USUARIOS_CACHE_TTL = config('USUARIOS_CACHE_TTL', default=0, cast=int)
+
+
+# Password hashing
+# https://docs.djangoproject.com/en/4.2/topics/auth/passwords/
+
+# algoritmo dos novos hashes: pbkdf2, scrypt ou argon2 (este requer argon2-cffi). Hashes de
+# outro algoritmo ou com outro custo são regravados no próximo login do usuário.
+# `manage.py benchmark_senhas` mede o custo de cada perfil.
+SENHAS_ALGORITMO = config('SENHAS_ALGORITMO', default='pbkdf2')
+SENHAS_PBKDF2_ITERACOES = config('SENHAS_PBKDF2_ITERACOES', default=600_000, cast=int)
+SENHAS_SCRYPT_N = config('SENHAS_SCRYPT_N', default=2 ** 14, cast=int)
+SENHAS_SCRYPT_R = config('SENHAS_SCRYPT_R', default=8, cast=int)
+SENHAS_SCRYPT_P = config('SENHAS_SCRYPT_P', default=1, cast=int)
+SENHAS_ARGON2_TIME_COST = config('SENHAS_ARGON2_TIME_COST', default=2, cast=int)
+SENHAS_ARGON2_MEMORY_COST = config('SENHAS_ARGON2_MEMORY_COST', default=102_400, cast=int)
+SENHAS_ARGON2_PARALLELISM = config('SENHAS_ARGON2_PARALLELISM', default=8, cast=int)
+
+# o hasher escolhido vem primeiro e gera os novos hashes; os demais apenas verificam os antigos
+_HASHERS = {
+    'pbkdf2': 'usuarios.hashers.PBKDF2Configuravel',
+    'scrypt': 'usuarios.hashers.ScryptConfiguravel',
+    'argon2': 'usuarios.hashers.Argon2Configuravel',
+}
+PASSWORD_HASHERS = [_HASHERS[SENHAS_ALGORITMO]] + [
+    hasher for algoritmo, hasher in _HASHERS.items() if algoritmo != SENHAS_ALGORITMO
+]
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -130,6 +204,33 @@ STATIC_ROOT = os.path.join('static')
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 MEDIA_URL = '/media/'
 
+# Certificados
+CERTIFICADOS_WORKERS = config('CERTIFICADOS_WORKERS', default=os.cpu_count() or 1, cast=int)
+CERTIFICADOS_LOTE = config('CERTIFICADOS_LOTE', default=50, cast=int)
+# segundos sem progresso depois dos quais uma tarefa em processamento é considerada abandonada
+CERTIFICADOS_TAREFA_TIMEOUT = config('CERTIFICADOS_TAREFA_TIMEOUT', default=600, cast=int)
+# formatos: png, png8 (paleta de 256 cores), webp ou jpeg
+CERTIFICADOS_FORMATO = config('CERTIFICADOS_FORMATO', default='png')
+CERTIFICADOS_QUALIDADE = config('CERTIFICADOS_QUALIDADE', default=85, cast=int)
+CERTIFICADOS_PNG_COMPRESSAO = config('CERTIFICADOS_PNG_COMPRESSAO', default=6, cast=int)
+# sob demanda: a geração só registra os dados e a imagem é renderizada no primeiro acesso
+CERTIFICADOS_SOB_DEMANDA = config('CERTIFICADOS_SOB_DEMANDA', default=False, cast=bool)
+CERTIFICADOS_CACHE_DIR = config('CERTIFICADOS_CACHE_DIR', default=os.path.join(BASE_DIR, 'cache', 'certificados'))
+CERTIFICADOS_CACHE_MAX_BYTES = config('CERTIFICADOS_CACHE_MAX_BYTES', default=500 * 1024 * 1024, cast=int)
+# exportação em PDF: páginas gravadas entre cada atualização do progresso e diretório do cache
+CERTIFICADOS_PDF_LOTE = config('CERTIFICADOS_PDF_LOTE', default=20, cast=int)
+CERTIFICADOS_PDF_DIR = config('CERTIFICADOS_PDF_DIR', default=os.path.join(BASE_DIR, 'cache', 'pdf'))
+
+# Exportação de participantes: linhas buscadas por vez no cursor do banco
+EXPORTACAO_CHUNK_SIZE = config('EXPORTACAO_CHUNK_SIZE', default=2000, cast=int)
+
+# Importação de participantes: linhas do CSV processadas por transação
+IMPORTACAO_LOTE = config('IMPORTACAO_LOTE', default=1000, cast=int)
+
+# Miniaturas (WebP) usadas nas listagens de certificados e logos
+MINIATURAS_QUALIDADE = config('MINIATURAS_QUALIDADE', default=80, cast=int)
+
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
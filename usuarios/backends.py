@@ -0,0 +1,39 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+UserModel = get_user_model()
+
+
+class UsernameOuEmailBackend(ModelBackend):
+    """
+    autentica pelo nome de usuário ou pelo e-mail com uma única consulta indexada
+    (username = ? OR LOWER(email) = ?) e calcula o hash da senha exatamente uma vez, inclusive
+    para usuários inexistentes, para que o tempo de resposta não revele quais existem
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+
+        # o e-mail é comparado sem diferenciar maiúsculas; com email > '' a consulta usa o
+        # índice único de LOWER(email) (usuarios/migrations/0001_email_unico.py)
+        candidatos = list(UserModel._default_manager.alias(email_normalizado=Lower('email')).filter(
+            Q(username=username) | Q(email_normalizado=username.lower(), email__gt='')
+        )[:3])
+        # o username é único e tem prioridade; pelo e-mail, só se ele identificar um único usuário
+        user = next((candidato for candidato in candidatos if candidato.username == username), None)
+        if user is None and len(candidatos) == 1:
+            user = candidatos[0]
+
+        if user is None:
+            # hash descartável, com o mesmo custo de uma verificação real
+            UserModel().set_password(password)
+            return None
+
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
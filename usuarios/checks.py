@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.core.checks import Error, register
+
+# backends cujo conteúdo não é visto pelos outros processos
+CACHES_LOCAIS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def _cache_local(alias):
+    return settings.CACHES.get(alias, {}).get('BACKEND') in CACHES_LOCAIS
+
+
+@register()
+def verificar_cache_compartilhado(app_configs, **kwargs):
+    """
+    com um cache local a cada processo, o logout ou a troca de senha feitos em um worker
+    não invalidam a sessão nem o usuário guardados no cache dos outros workers
+    """
+    erros = []
+
+    if settings.SESSION_ENGINE == 'django.contrib.sessions.backends.cached_db' \
+            and _cache_local(settings.SESSION_CACHE_ALIAS):
+        erros.append(Error(
+            'As sessões cached_db exigem um cache compartilhado entre os workers.',
+            hint='Use SESSOES_MODO=db ou configure CACHE_BACKEND com um cache compartilhado (ex.: Redis).',
+            id='usuarios.E001',
+        ))
+
+    if settings.USUARIOS_CACHE_TTL > 0 and _cache_local('default'):
+        erros.append(Error(
+            'O cache de usuários (USUARIOS_CACHE_TTL) exige um cache compartilhado entre os workers.',
+            hint='Use USUARIOS_CACHE_TTL=0 ou configure CACHE_BACKEND com um cache compartilhado (ex.: Redis).',
+            id='usuarios.E002',
+        ))
+
+    return erros
@@ -0,0 +1,48 @@
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, PBKDF2PasswordHasher, ScryptPasswordHasher
+
+# Os hashers abaixo mantêm o nome do algoritmo do Django, então os hashes já gravados
+# continuam válidos. O custo vem das settings (SENHAS_*) a cada uso; quando ele muda,
+# must_update() passa a valer para os hashes antigos e o Django os regrava no próximo login.
+
+
+class PBKDF2Configuravel(PBKDF2PasswordHasher):
+    @property
+    def iterations(self):
+        return settings.SENHAS_PBKDF2_ITERACOES
+
+
+class ScryptConfiguravel(ScryptPasswordHasher):
+    @property
+    def work_factor(self):
+        return settings.SENHAS_SCRYPT_N
+
+    @property
+    def block_size(self):
+        return settings.SENHAS_SCRYPT_R
+
+    @property
+    def parallelism(self):
+        return settings.SENHAS_SCRYPT_P
+
+    @property
+    def maxmem(self):
+        # o padrão do OpenSSL (32 MiB) não basta para N e r maiores
+        return 128 * self.work_factor * self.block_size * 2
+
+
+class Argon2Configuravel(Argon2PasswordHasher):
+    """requer o pacote argon2-cffi"""
+
+    @property
+    def time_cost(self):
+        return settings.SENHAS_ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.SENHAS_ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        return settings.SENHAS_ARGON2_PARALLELISM
+
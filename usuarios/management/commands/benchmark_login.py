@@ -0,0 +1,64 @@
+from time import perf_counter
+
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from usuarios.backends import UsernameOuEmailBackend
+
+CENARIOS = (
+    ('username', 'benchmark-login', 'senha-benchmark'),
+    ('e-mail', 'benchmark-login@example.com', 'senha-benchmark'),
+    ('senha errada', 'benchmark-login@example.com', 'errada'),
+    ('inexistente', 'ninguem@example.com', 'senha-benchmark'),
+)
+
+
+def _login_antigo(userinput, senha):
+    """implementação antiga da view: busca pelo e-mail e, se falhar, autentica pelo username"""
+    backend = ModelBackend()
+    try:
+        user = User.objects.get(email=userinput)
+        return backend.authenticate(None, username=user.username, password=senha)
+    except Exception:
+        return backend.authenticate(None, username=userinput, password=senha)
+
+
+def _login_novo(userinput, senha):
+    return UsernameOuEmailBackend().authenticate(None, username=userinput, password=senha)
+
+
+class Command(BaseCommand):
+    help = ('Mede a vazão do login (por username, e-mail, com senha errada e com usuário inexistente) '
+            'antes e depois do backend de autenticação único. Os dados de teste são descartados ao final.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeticoes', type=int, default=20,
+                            help='Quantidade de logins medidos em cada cenário.')
+
+    def _medir(self, login, userinput, senha, repeticoes):
+        with CaptureQueriesContext(connection) as consultas:
+            inicio = perf_counter()
+            for _ in range(repeticoes):
+                login(userinput, senha)
+            tempo = perf_counter() - inicio
+        return repeticoes / tempo, len(consultas) / repeticoes
+
+    def handle(self, *args, **options):
+        repeticoes = options['repeticoes']
+
+        with transaction.atomic():
+            User.objects.create_user(username='benchmark-login', email='benchmark-login@example.com',
+                                     password='senha-benchmark')
+
+            self.stdout.write(f'{"cenário":<14} {"antes (login/s)":>16} {"consultas":>10} '
+                              f'{"depois (login/s)":>17} {"consultas":>10}')
+            for nome, userinput, senha in CENARIOS:
+                antes, consultas_antes = self._medir(_login_antigo, userinput, senha, repeticoes)
+                depois, consultas_depois = self._medir(_login_novo, userinput, senha, repeticoes)
+                self.stdout.write(f'{nome:<14} {antes:>16.1f} {consultas_antes:>10.1f} '
+                                  f'{depois:>17.1f} {consultas_depois:>10.1f}')
+
+            transaction.set_rollback(True)
@@ -0,0 +1,62 @@
+from math import ceil
+from time import perf_counter
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from usuarios.hashers import Argon2Configuravel, PBKDF2Configuravel, ScryptConfiguravel
+
+PERFIS = (
+    ('pbkdf2 600k', PBKDF2Configuravel, {'SENHAS_PBKDF2_ITERACOES': 600_000}),
+    ('pbkdf2 300k', PBKDF2Configuravel, {'SENHAS_PBKDF2_ITERACOES': 300_000}),
+    ('pbkdf2 100k', PBKDF2Configuravel, {'SENHAS_PBKDF2_ITERACOES': 100_000}),
+    ('scrypt N=2^14', ScryptConfiguravel, {'SENHAS_SCRYPT_N': 2 ** 14, 'SENHAS_SCRYPT_R': 8, 'SENHAS_SCRYPT_P': 1}),
+    ('scrypt N=2^15', ScryptConfiguravel, {'SENHAS_SCRYPT_N': 2 ** 15, 'SENHAS_SCRYPT_R': 8, 'SENHAS_SCRYPT_P': 1}),
+    ('argon2 padrão', Argon2Configuravel, {'SENHAS_ARGON2_TIME_COST': 2, 'SENHAS_ARGON2_MEMORY_COST': 102_400,
+                                           'SENHAS_ARGON2_PARALLELISM': 8}),
+    ('argon2 19MiB', Argon2Configuravel, {'SENHAS_ARGON2_TIME_COST': 2, 'SENHAS_ARGON2_MEMORY_COST': 19_456,
+                                          'SENHAS_ARGON2_PARALLELISM': 1}),
+)
+
+
+class Command(BaseCommand):
+    help = ('Mede os hashes de senha por segundo de cada perfil de custo (e do perfil configurado) '
+            'e estima quantos workers são necessários para um pico de logins/cadastros.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeticoes', type=int, default=5,
+                            help='Quantidade de hashes medidos em cada perfil.')
+        parser.add_argument('--pico', type=float, default=10,
+                            help='Logins/cadastros por segundo no pico, para estimar os workers.')
+        parser.add_argument('--latencia-maxima', type=float, default=250,
+                            help='Tempo máximo aceitável de um hash, em ms; perfis acima são marcados.')
+
+    def _medir(self, hasher, repeticoes):
+        salt = hasher.salt()
+        inicio = perf_counter()
+        for _ in range(repeticoes):
+            hasher.encode('senha-de-benchmark', salt)
+        return (perf_counter() - inicio) / repeticoes
+
+    def handle(self, *args, **options):
+        perfis = [(f'configurado ({settings.SENHAS_ALGORITMO})', type(get_hasher()), {})] + list(PERFIS)
+
+        self.stdout.write(f'{"perfil":<22} {"ms/hash":>9} {"hashes/s":>9} {"workers":>8}')
+        for nome, hasher, custo in perfis:
+            with override_settings(**custo):
+                try:
+                    tempo = self._medir(hasher(), options['repeticoes'])
+                except ValueError as erro:
+                    # biblioteca opcional ausente (ex.: argon2-cffi)
+                    self.stdout.write(f'{nome:<22} {"indisponível":>9}  {erro}')
+                    continue
+
+            # hashes/s de um worker (um núcleo); cada login ou cadastro calcula um hash
+            vazao = 1 / tempo
+            linha = f'{nome:<22} {tempo * 1000:>9.1f} {vazao:>9.1f} {ceil(options["pico"] / vazao):>8}'
+            if tempo * 1000 > options['latencia_maxima']:
+                self.stdout.write(self.style.WARNING(f'{linha}  acima de {options["latencia_maxima"]:.0f} ms'))
+            else:
+                self.stdout.write(linha)
@@ -0,0 +1,55 @@
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.utils.crypto import constant_time_compare
+from django.utils.functional import SimpleLazyObject
+
+
+def chave_usuario(user_id):
+    return f'usuarios:usuario:{user_id}'
+
+
+def _usuario_da_sessao(request):
+    """
+    como django.contrib.auth.get_user, mas busca o usuário no cache antes do banco.
+    O hash da senha guardado na sessão continua sendo conferido, então trocar a senha
+    ainda encerra as outras sessões.
+    """
+    user_id = request.session.get(SESSION_KEY)
+    backend = request.session.get(BACKEND_SESSION_KEY)
+
+    if settings.USUARIOS_CACHE_TTL <= 0 or user_id is None or backend not in settings.AUTHENTICATION_BACKENDS:
+        return auth.get_user(request)
+
+    chave = chave_usuario(user_id)
+    user = cache.get(chave)
+
+    if user is None:
+        user = auth.get_user(request)
+        if user.is_authenticated:
+            cache.set(chave, user, settings.USUARIOS_CACHE_TTL)
+        return user
+
+    hash_da_sessao = request.session.get(HASH_SESSION_KEY)
+    if not (hash_da_sessao and constant_time_compare(hash_da_sessao, user.get_session_auth_hash())):
+        request.session.flush()
+        return AnonymousUser()
+
+    user.backend = backend
+    return user
+
+
+class UsuarioEmCacheMiddleware(AuthenticationMiddleware):
+    """
+    AuthenticationMiddleware que guarda o usuário autenticado no cache por
+    USUARIOS_CACHE_TTL segundos (0 desativa o cache). O cache é invalidado quando o
+    usuário é salvo ou removido (usuarios/signals.py); alterações feitas com update()
+    duram até o TTL.
+    """
+
+    def process_request(self, request):
+        super().process_request(request)
+        request.user = SimpleLazyObject(lambda: _usuario_da_sessao(request))
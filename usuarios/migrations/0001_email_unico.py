@@ -0,0 +1,33 @@
+from django.db import migrations
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+INDICE_EMAIL = 'auth_user_email_unico'
+
+
+def verificar_emails_duplicados(apps, schema_editor):
+    User = apps.get_model('auth', 'User')
+    duplicados = list(User.objects.exclude(email='').annotate(email_normalizado=Lower('email')).values(
+        'email_normalizado').annotate(quantidade=Count('id')).filter(quantidade__gt=1).values_list(
+        'email_normalizado', flat=True)[:20])
+
+    if duplicados:
+        raise RuntimeError('Há usuários com o mesmo e-mail; resolva antes de aplicar a migração: '
+                           + ', '.join(duplicados))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunPython(verificar_emails_duplicados, migrations.RunPython.noop),
+        # e-mail único sem diferenciar maiúsculas; usuários sem e-mail (criados pelo admin) ficam de fora.
+        # A condição é "email > ''" (e não "<> ''") para que consultas com email__gt='' usem o índice
+        migrations.RunSQL(
+            f"CREATE UNIQUE INDEX {INDICE_EMAIL} ON auth_user (LOWER(email)) WHERE email > '';",
+            f'DROP INDEX {INDICE_EMAIL};',
+        ),
+    ]
@@ -0,0 +1,12 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .middleware import chave_usuario
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidar_usuario_em_cache(sender, instance, **kwargs):
+    cache.delete(chave_usuario(instance.pk))
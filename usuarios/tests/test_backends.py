@@ -0,0 +1,44 @@
+from unittest import mock
+
+from django.contrib.auth import authenticate
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+
+class UsernameOuEmailBackendTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='raphael', email='raphael@mail.com', password='password123')
+
+    def test_authenticates_with_username_or_email_in_one_query(self):
+        for login in ('raphael', 'raphael@mail.com'):
+            with self.assertNumQueries(1):
+                self.assertEqual(authenticate(username=login, password='password123'), self.user)
+
+    def test_wrong_password_or_unknown_user_is_rejected(self):
+        self.assertIsNone(authenticate(username='raphael', password='errada'))
+        self.assertIsNone(authenticate(username='raphael@mail.com', password='errada'))
+        self.assertIsNone(authenticate(username='ninguem', password='password123'))
+
+    def test_inactive_user_is_rejected(self):
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+
+        self.assertIsNone(authenticate(username='raphael', password='password123'))
+
+    def test_password_is_hashed_exactly_once_for_unknown_users(self):
+        with mock.patch('django.contrib.auth.hashers.PBKDF2PasswordHasher.encode',
+                        autospec=True, return_value='x') as encode:
+            authenticate(username='ninguem@mail.com', password='password123')
+
+        encode.assert_called_once()
+
+    def test_username_takes_precedence_over_another_users_email(self):
+        User.objects.create_user(username='outro', email='raphael', password='outrasenha')
+
+        self.assertEqual(authenticate(username='raphael', password='password123'), self.user)
+        self.assertIsNone(authenticate(username='raphael', password='outrasenha'))
+
+    def test_email_is_case_insensitive(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(authenticate(username='Raphael@Mail.com', password='password123'), self.user)
@@ -0,0 +1,60 @@
+from unittest import skipUnless
+
+from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+
+try:
+    import argon2
+except ImportError:
+    argon2 = None
+
+HASHERS = [
+    'usuarios.hashers.PBKDF2Configuravel',
+    'usuarios.hashers.ScryptConfiguravel',
+    'usuarios.hashers.Argon2Configuravel',
+]
+
+
+@override_settings(PASSWORD_HASHERS=HASHERS, SENHAS_PBKDF2_ITERACOES=1000, SENHAS_SCRYPT_N=2 ** 10)
+class HashersConfiguraveisTestCase(TestCase):
+    def test_cost_comes_from_settings(self):
+        self.assertTrue(make_password('senha').startswith('pbkdf2_sha256$1000$'))
+
+        with override_settings(SENHAS_PBKDF2_ITERACOES=2000):
+            self.assertTrue(make_password('senha').startswith('pbkdf2_sha256$2000$'))
+
+    def test_hash_is_upgraded_on_login_when_cost_changes(self):
+        user = User.objects.create_user(username='raphael', password='password123')
+
+        with override_settings(SENHAS_PBKDF2_ITERACOES=2000):
+            self.assertEqual(authenticate(username='raphael', password='password123'), user)
+
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith('pbkdf2_sha256$2000$'))
+
+    def test_hash_is_migrated_on_login_when_algorithm_changes(self):
+        user = User.objects.create_user(username='raphael', password='password123')
+
+        with override_settings(PASSWORD_HASHERS=[HASHERS[1], HASHERS[0], HASHERS[2]]):
+            self.assertEqual(authenticate(username='raphael', password='password123'), user)
+
+            user.refresh_from_db()
+            self.assertEqual(identify_hasher(user.password).algorithm, 'scrypt')
+            self.assertIn('$1024$', user.password)
+            self.assertEqual(authenticate(username='raphael', password='password123'), user)
+
+    def test_hash_is_not_rewritten_when_nothing_changes(self):
+        user = User.objects.create_user(username='raphael', password='password123')
+
+        with self.assertNumQueries(1):
+            authenticate(username='raphael', password='password123')
+
+        self.assertEqual(User.objects.get(pk=user.pk).password, user.password)
+
+    @skipUnless(argon2, 'argon2-cffi não está instalado')
+    @override_settings(PASSWORD_HASHERS=[HASHERS[2]], SENHAS_ARGON2_TIME_COST=1,
+                       SENHAS_ARGON2_MEMORY_COST=1024, SENHAS_ARGON2_PARALLELISM=1)
+    def test_argon2_cost_comes_from_settings(self):
+        self.assertIn('m=1024,t=1,p=1', make_password('senha'))
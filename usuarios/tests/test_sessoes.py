@@ -0,0 +1,161 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from eventos.models import Evento
+from usuarios.checks import verificar_cache_compartilhado
+
+MIDDLEWARE_SEM_CACHE = [
+    'django.middleware.security.SecurityMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+SESSOES_DB = 'django.contrib.sessions.backends.db'
+SESSOES_CACHED_DB = 'django.contrib.sessions.backends.cached_db'
+CACHE_LOCAL = 'django.core.cache.backends.locmem.LocMemCache'
+CACHE_COMPARTILHADO = 'django.core.cache.backends.redis.RedisCache'
+
+
+def trabalhador(nome):
+    """simula um worker com o próprio cache local em memória"""
+    return override_settings(CACHES={'default': {'BACKEND': CACHE_LOCAL, 'LOCATION': nome}})
+
+
+# nos testes o LocMemCache faz o papel do cache compartilhado: há um único processo
+@override_settings(SESSION_ENGINE=SESSOES_CACHED_DB, USUARIOS_CACHE_TTL=300)
+class SessaoEUsuarioEmCacheTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='raphael', password='password123')
+        evento = Evento.objects.create(
+            criador=cls.user,
+            nome='Test Event',
+            slug='test-event',
+            descricao='This is a test event',
+            data_inicio='2023-01-01',
+            data_termino='2023-01-02',
+            carga_horaria=8,
+            logo='logos/test.png'
+        )
+        evento.participantes.add(cls.user)
+
+    def entrar(self):
+        self.client.login(username='raphael', password='password123')
+        # a primeira requisição guarda o usuário no cache
+        self.client.get(reverse('gerenciar_eventos'))
+
+    @override_settings(SESSION_ENGINE=SESSOES_DB, MIDDLEWARE=MIDDLEWARE_SEM_CACHE)
+    def test_db_sessions_read_session_and_user_on_every_request(self):
+        self.entrar()
+
+        # antes: sessão + usuário + eventos
+        with self.assertNumQueries(3):
+            self.client.get(reverse('gerenciar_eventos'))
+        # antes: sessão + usuário + eventos + certificados (prefetch)
+        with self.assertNumQueries(4):
+            self.client.get(reverse('meus_eventos'))
+
+    def test_authenticated_requests_only_query_their_own_data(self):
+        self.entrar()
+
+        with self.assertNumQueries(1):
+            self.client.get(reverse('gerenciar_eventos'))
+        with self.assertNumQueries(2):
+            self.client.get(reverse('meus_eventos'))
+        with self.assertNumQueries(1):
+            self.client.get(reverse('meus_certificados'))
+
+    @override_settings(SESSION_ENGINE='django.contrib.sessions.backends.signed_cookies')
+    def test_cookie_sessions_do_not_use_the_session_table(self):
+        self.entrar()
+
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('gerenciar_eventos'))
+
+        self.assertEqual(response.wsgi_request.user, self.user)
+        self.assertFalse(Session.objects.exists())
+
+    def test_saving_the_user_refreshes_the_cached_copy(self):
+        self.entrar()
+        self.user.first_name = 'Raphael'
+        self.user.save()
+
+        response = self.client.get(reverse('gerenciar_eventos'))
+
+        self.assertEqual(response.wsgi_request.user.first_name, 'Raphael')
+
+    def test_password_change_logs_out_other_sessions(self):
+        self.entrar()
+        self.user.set_password('outrasenha123')
+        self.user.save()
+
+        response = self.client.get(reverse('gerenciar_eventos'))
+
+        self.assertRedirects(response, '/usuarios/login/?next=/eventos/gerenciar_eventos/')
+
+    def test_deactivated_user_is_logged_out(self):
+        self.entrar()
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.client.get(reverse('gerenciar_eventos'))
+
+        self.assertEqual(response.status_code, 302)
+
+
+class LogoutEntreTrabalhadoresTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='raphael', password='password123')
+
+    def sair_em_a_e_voltar_em_b(self):
+        """faz logout no worker A e repete o cookie da sessão encerrada no worker B"""
+        self.client.login(username='raphael', password='password123')
+        for nome in ('a', 'b'):
+            with trabalhador(nome):
+                self.assertEqual(self.client.get(reverse('gerenciar_eventos')).status_code, 200)
+
+        sessao = self.client.cookies[settings.SESSION_COOKIE_NAME].value
+        with trabalhador('a'):
+            self.client.get(reverse('logout'))
+
+        self.client.cookies[settings.SESSION_COOKIE_NAME] = sessao
+        with trabalhador('b'):
+            return self.client.get(reverse('gerenciar_eventos'))
+
+    def test_default_configuration_logs_out_every_worker(self):
+        response = self.sair_em_a_e_voltar_em_b()
+
+        self.assertRedirects(response, '/usuarios/login/?next=/eventos/gerenciar_eventos/')
+
+    @override_settings(SESSION_ENGINE=SESSOES_CACHED_DB, USUARIOS_CACHE_TTL=300)
+    def test_cached_sessions_on_local_caches_survive_logout(self):
+        # por isso a verificação do sistema recusa cached_db e o cache de usuários com cache local
+        response = self.sair_em_a_e_voltar_em_b()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.wsgi_request.user, self.user)
+
+
+class VerificacaoCacheCompartilhadoTestCase(SimpleTestCase):
+    def ids(self):
+        return [erro.id for erro in verificar_cache_compartilhado(None)]
+
+    def test_default_configuration_passes(self):
+        with override_settings(SESSION_ENGINE=SESSOES_DB, USUARIOS_CACHE_TTL=0):
+            self.assertEqual(self.ids(), [])
+
+    def test_cached_sessions_and_user_cache_require_a_shared_cache(self):
+        with trabalhador('a'), override_settings(SESSION_ENGINE=SESSOES_CACHED_DB, USUARIOS_CACHE_TTL=300):
+            self.assertEqual(self.ids(), ['usuarios.E001', 'usuarios.E002'])
+
+    def test_shared_cache_allows_cached_sessions_and_user_cache(self):
+        caches = {'default': {'BACKEND': CACHE_COMPARTILHADO, 'LOCATION': 'redis://127.0.0.1:6379'}}
+        with override_settings(CACHES=caches, SESSION_ENGINE=SESSOES_CACHED_DB, USUARIOS_CACHE_TTL=300):
+            self.assertEqual(self.ids(), [])
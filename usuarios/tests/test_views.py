@@ -1,5 +1,9 @@
+import threading
+
 from django.contrib.auth.models import User
-from django.test import TestCase
+from django.db import connection
+from django.test import Client, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 
@@ -85,6 +89,83 @@ class CadastroViewTestCase(TestCase):
         self.assertRedirects(response, reverse('cadastro'))
 
 
+    def test_cadastro_with_existing_email_in_another_case(self):
+        response = self.client.post(reverse('cadastro'), {
+            'username': 'newuser',
+            'email': 'TEST@example.com',
+            'senha': 'Newpass123',
+            'confirmar_senha': 'Newpass123'
+        }, follow=True)
+        self.assertRedirects(response, reverse('cadastro'))
+        self.assertContains(response, 'Este email já está cadastrado.')
+        self.assertFalse(User.objects.filter(username='newuser').exists())
+
+    def test_cadastro_with_existing_username_shows_message(self):
+        response = self.client.post(reverse('cadastro'), {
+            'username': 'testuser',
+            'email': 'newuser@example.com',
+            'senha': 'Newpass123',
+            'confirmar_senha': 'Newpass123'
+        }, follow=True)
+        self.assertContains(response, 'Este nome de usuário já está cadastrado.')
+
+    def test_cadastro_is_a_single_write(self):
+        with CaptureQueriesContext(connection) as consultas:
+            self.client.post(reverse('cadastro'), {
+                'username': 'newuser123',
+                'email': 'newuser@example.com',
+                'senha': 'Newpass123',
+                'confirmar_senha': 'Newpass123'
+            })
+
+        comandos = [consulta['sql'].split()[0].upper() for consulta in consultas]
+        self.assertEqual([comando for comando in comandos if comando in ('SELECT', 'INSERT', 'UPDATE')],
+                         ['INSERT'])
+
+
+class CadastroConcorrenteTestCase(TransactionTestCase):
+    def _cadastrar_em_paralelo(self, dados):
+        respostas = []
+        barreira = threading.Barrier(len(dados))
+
+        def cadastrar(dados):
+            try:
+                barreira.wait()
+                respostas.append(Client().post(reverse('cadastro'), dados))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=cadastrar, args=(d,)) for d in dados]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return respostas
+
+    def test_concurrent_signups_with_same_email_create_one_user(self):
+        respostas = self._cadastrar_em_paralelo([{
+            'username': f'usuario{i}',
+            'email': 'mesmo@example.com' if i % 2 else 'MESMO@example.com',
+            'senha': 'Newpass123',
+            'confirmar_senha': 'Newpass123'
+        } for i in range(6)])
+
+        self.assertEqual(sorted(resposta.url for resposta in respostas),
+                         [reverse('cadastro')] * 5 + [reverse('login')])
+        self.assertEqual(User.objects.count(), 1)
+
+    def test_concurrent_signups_with_same_username_create_one_user(self):
+        respostas = self._cadastrar_em_paralelo([{
+            'username': 'mesmo',
+            'email': f'usuario{i}@example.com',
+            'senha': 'Newpass123',
+            'confirmar_senha': 'Newpass123'
+        } for i in range(6)])
+
+        self.assertEqual([resposta.status_code for resposta in respostas], [302] * 6)
+        self.assertEqual(User.objects.filter(username='mesmo').count(), 1)
+
+
 class LoginViewTestCase(TestCase):
     @classmethod
     def setUpTestData(cls):
@@ -1,10 +1,14 @@
 from django.contrib import auth, messages
 from django.contrib.auth.models import User
 from django.contrib.messages import constants
+from django.db import DatabaseError, IntegrityError, transaction
 from django.shortcuts import redirect, render
 
 from .utils import email_is_valid, password_is_valid, username_is_valid
 
+# índice único de LOWER(email) criado em usuarios/migrations/0001_email_unico.py
+INDICE_EMAIL = 'auth_user_email_unico'
+
 
 def cadastro(request):
     if request.method == 'POST':
@@ -22,43 +26,32 @@ def cadastro(request):
         if not password_is_valid(request, senha, confirmar_senha):
             return redirect(to='cadastro')
 
-        user = User.objects.filter(username=username)
-
-        if user.exists():
-            messages.add_message(
-                request,
-                constants.WARNING,
-                message='Este nome de usuário já está cadastrado.'
-            )
-            return redirect(to='cadastro')
-
-        user_email = User.objects.filter(email=email)
-
-        if user_email.exists():
-            messages.add_message(
-                request,
-                constants.WARNING,
-                message='Este email já está cadastrado.'
-            )
-            return redirect(to='cadastro')
-
+        # um único INSERT; as restrições únicas do banco (username e e-mail sem diferenciar
+        # maiúsculas) decidem, inclusive entre cadastros simultâneos
         try:
-            novo_usuario = User.objects.create_user(username, email, senha)
-            novo_usuario.save()
-
-            messages.add_message(
-                request,
-                constants.SUCCESS,
-                message='Usuário cadastrado com sucesso.'
-            )
-            return redirect(to='login')
-        except:
+            with transaction.atomic():
+                User.objects.create_user(username, email, senha)
+        except IntegrityError as erro:
+            if INDICE_EMAIL in str(erro):
+                mensagem = 'Este email já está cadastrado.'
+            else:
+                mensagem = 'Este nome de usuário já está cadastrado.'
+            messages.add_message(request, constants.WARNING, message=mensagem)
+            return redirect(to='cadastro')
+        except DatabaseError:
             messages.add_message(
                 request,
                 constants.ERROR,
                 message='Erro interno do sistema.'
             )
             return redirect(to='cadastro')
+
+        messages.add_message(
+            request,
+            constants.SUCCESS,
+            message='Usuário cadastrado com sucesso.'
+        )
+        return redirect(to='login')
     else:
         if request.user.is_authenticated:
             return redirect(to='gerenciar_eventos')
@@ -71,30 +64,16 @@ def login(request):
         userinput = request.POST.get('username')
         senha = request.POST.get('senha')
 
-        # login com username ou e-mail:
-        try:
-            user = User.objects.get(email=userinput)
-            account = auth.authenticate(
-                request, username=user.username, password=senha)
-
-            if not account:
-                messages.error(
-                    request, message='login ou senha inválidos.')
-                return redirect(to='login')
-
-            auth.login(request, account)
-            return redirect(to='gerenciar_eventos')
-        except:
-            account = auth.authenticate(
-                request, username=userinput, password=senha)
+        # login com username ou e-mail (usuarios.backends.UsernameOuEmailBackend):
+        account = auth.authenticate(request, username=userinput, password=senha)
 
-            if not account:
-                messages.error(
-                    request, message='login ou senha inválidos.')
-                return redirect(to='login')
+        if not account:
+            messages.error(
+                request, message='login ou senha inválidos.')
+            return redirect(to='login')
 
-            auth.login(request, account)
-            return redirect(to='gerenciar_eventos')
+        auth.login(request, account)
+        return redirect(to='gerenciar_eventos')
 
     else:
         if request.user.is_authenticated: